@@ -1,12 +1,16 @@
 """APKG read/write operations."""
+import functools
+import hashlib
+import os
 import sqlite3
 import tempfile
 import zipfile
+from contextlib import closing, contextmanager
 from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterable, Iterator, List, Optional, Tuple
 
-import genanki
 import zstandard as zstd
 
 from .config import (
@@ -20,6 +24,22 @@ from .config import (
     MODEL_NAME,
 )
 
+# genanki is only needed when writing decks; importing it lazily keeps
+# read-only commands (sync, status, export, ...) from paying its import time
+if TYPE_CHECKING:
+    import genanki
+
+# Linux tmpfs; used for the temp-file fallback so it never touches disk
+_SHM_DIR = Path("/dev/shm")
+
+_EMPTY_FIELDS = ("",) * len(FIELDS)
+
+# notes_data dict keys, in FIELDS order
+_NOTE_KEYS = ("front", "back", "example", "comment", "collocations", "etymology")
+
+# Reused across reads; each call gets its own independent stream reader
+_DCTX = zstd.ZstdDecompressor()
+
 
 @dataclass
 class AnkiNote:
@@ -36,77 +56,141 @@ class AnkiNote:
     tags: List[str] = field(default_factory=list)
 
 
-def _decompress_anki21b(data: bytes) -> bytes:
-    """Decompress zstandard-compressed anki21b data."""
-    dctx = zstd.ZstdDecompressor()
-    return dctx.decompress(data, max_output_size=50 * 1024 * 1024)
+def _decompress_anki21b(src: BinaryIO) -> bytes:
+    """Stream-decompress zstandard-compressed anki21b data from a file object.
+
+    Streaming avoids holding the compressed blob alongside the output and
+    has no upper bound on the decompressed size.
+    """
+    with _DCTX.stream_reader(src) as reader:
+        return reader.read()
 
 
-def read_apkg_notes(apkg_path: str | Path) -> List[AnkiNote]:
-    """Read all notes from an APKG file.
+def _read_collection_bytes(apkg_path: Path) -> bytes:
+    """Return the decompressed collection database stored in an APKG."""
+    with zipfile.ZipFile(apkg_path, "r") as zf:
+        names = zf.namelist()
+        if "collection.anki21b" in names:
+            with zf.open("collection.anki21b") as src:
+                return _decompress_anki21b(src)
+        if "collection.anki2" in names:
+            return zf.read("collection.anki2")
+    raise ValueError(
+        f"No collection database found in {apkg_path}. "
+        f"Files present: {names}"
+    )
+
+
+def _connect_collection(db_bytes: bytes) -> Tuple[sqlite3.Connection, Optional[Path]]:
+    """Open decompressed collection bytes as a SQLite connection.
+
+    Deserializes straight into an in-memory database when sqlite3 supports
+    it. Otherwise writes a temp file (on tmpfs if available) and opens it
+    read-only/immutable so SQLite skips journal setup. Returns the
+    connection and the temp file to remove, if any. Both paths copy the
+    bytes, so callers should not keep their own reference past this call.
+    """
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.deserialize(db_bytes)
+    except (AttributeError, sqlite3.Error):
+        # sqlite3 built without SQLITE_ENABLE_DESERIALIZE
+        conn.close()
+    else:
+        return conn, None
+
+    tmp_dir = _SHM_DIR if _SHM_DIR.is_dir() else None
+    with tempfile.NamedTemporaryFile(suffix=".db", dir=tmp_dir, delete=False) as tmp:
+        tmp.write(db_bytes)
+        tmp_path = Path(tmp.name)
+    try:
+        conn = sqlite3.connect(f"{tmp_path.as_uri()}?mode=ro&immutable=1", uri=True)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return conn, tmp_path
+
+
+@contextmanager
+def _open_collection(apkg_path: Path) -> Iterator[sqlite3.Connection]:
+    """Open the collection inside an APKG, closing it (and any temp file) on exit.
+
+    The decompressed bytes are only referenced while the connection is
+    being set up, so they are freed before any rows are read and the
+    database is not held in memory twice.
+    """
+    conn, tmp_path = _connect_collection(_read_collection_bytes(apkg_path))
+    try:
+        yield conn
+    finally:
+        conn.close()
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
+
+
+def iter_apkg_notes(apkg_path: str | Path) -> Iterator[AnkiNote]:
+    """Yield notes from an APKG file one at a time.
 
     Handles both old (collection.anki2) and new (collection.anki21b) formats.
     The new format requires zstandard decompression before SQLite access.
+    The collection is opened in memory; nothing is written to disk unless
+    sqlite3 lacks deserialize support. Notes are built lazily, so callers
+    that stop early skip the rest of the deck; close the generator (or use
+    contextlib.closing) to release the collection promptly.
     """
     apkg_path = Path(apkg_path)
     if not apkg_path.exists():
         raise FileNotFoundError(f"APKG file not found: {apkg_path}")
 
-    with zipfile.ZipFile(apkg_path, "r") as zf:
-        names = zf.namelist()
-        if "collection.anki21b" in names:
-            compressed = zf.read("collection.anki21b")
-            db_bytes = _decompress_anki21b(compressed)
-        elif "collection.anki2" in names:
-            db_bytes = zf.read("collection.anki2")
-        else:
-            raise ValueError(
-                f"No collection database found in {apkg_path}. "
-                f"Files present: {names}"
+    with _open_collection(apkg_path) as conn:
+        cursor = conn.execute("SELECT id, guid, flds, tags FROM notes")
+        for note_id, guid, flds, tags_str in cursor:
+            # maxsplit=6 keeps any extra fields in the discarded 7th slot;
+            # the padding covers notes with fewer than six fields
+            front, back, example, comment, collocations, etymology, *_ = (
+                *flds.split("\x1f", 6), *_EMPTY_FIELDS
             )
-
-    # Write to temp file for sqlite3 access
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
-        tmp.write(db_bytes)
-        tmp_path = tmp.name
-
-    notes = []
-    try:
-        conn = sqlite3.connect(tmp_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, guid, flds, tags FROM notes")
-        for row in cursor.fetchall():
-            note_id = row[0]
-            guid = row[1]
-            fields = row[2].split("\x1f")
-            tags_str = row[3].strip() if row[3] else ""
             tags = tags_str.split() if tags_str else []
 
-            while len(fields) < 6:
-                fields.append("")
-
-            notes.append(
-                AnkiNote(
-                    note_id=note_id,
-                    guid=guid,
-                    front=fields[0],
-                    back=fields[1],
-                    example=fields[2],
-                    comment=fields[3],
-                    collocations=fields[4],
-                    etymology=fields[5],
-                    tags=tags,
-                )
+            yield AnkiNote(
+                note_id=note_id,
+                guid=guid,
+                front=front,
+                back=back,
+                example=example,
+                comment=comment,
+                collocations=collocations,
+                etymology=etymology,
+                tags=tags,
             )
-        conn.close()
-    finally:
-        Path(tmp_path).unlink(missing_ok=True)
 
-    return notes
+
+def read_apkg_notes(apkg_path: str | Path) -> List[AnkiNote]:
+    """Read all notes from an APKG file (see iter_apkg_notes)."""
+    return list(iter_apkg_notes(apkg_path))
+
+
+def find_candidates(
+    apkg_path: str | Path,
+    predicate: Callable[[AnkiNote], bool],
+    limit: Optional[int] = None,
+) -> List[AnkiNote]:
+    """Return the first `limit` notes matching predicate, in deck order.
+
+    Stops reading the deck once `limit` matches are found.
+    """
+    with closing(iter_apkg_notes(apkg_path)) as notes:
+        return list(islice(filter(predicate, notes), limit))
 
 
-def get_anki_model() -> genanki.Model:
-    """Create the genanki Model matching the existing deck's notetype."""
+@functools.lru_cache(maxsize=1)
+def get_anki_model() -> "genanki.Model":
+    """Return the genanki Model matching the existing deck's notetype.
+
+    Built once per process; the model only depends on constants in config.
+    """
+    import genanki
+
     return genanki.Model(
         MODEL_ID,
         MODEL_NAME,
@@ -122,16 +206,33 @@ def get_anki_model() -> genanki.Model:
     )
 
 
+@functools.lru_cache(maxsize=None)
 def deck_id_from_name(name: str) -> int:
-    """Generate a stable deck ID from a name."""
-    import hashlib
+    """Generate a stable deck ID from a name (first 48 bits of SHA-256)."""
+    return int.from_bytes(hashlib.sha256(name.encode()).digest()[:6], "big")
+
+
+def write_package(package: "genanki.Package", output_path: str | Path) -> Path:
+    """Write a genanki Package atomically.
 
-    h = int(hashlib.sha256(name.encode()).hexdigest()[:12], 16)
-    return h
+    The APKG is written to a temp file next to output_path and renamed
+    into place, so an interrupted write never leaves a truncated file.
+    """
+    output_path = Path(output_path)
+    # A sibling path keeps the rename on one filesystem; letting genanki
+    # create the file gives it normal umask permissions
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    try:
+        package.write_to_file(str(tmp_path))
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return output_path
 
 
 def create_supplement_apkg(
-    notes_data: List[dict],
+    notes_data: Iterable[dict],
     output_path: str | Path,
     tags: Optional[List[str]] = None,
     deck_name: Optional[str] = None,
@@ -140,7 +241,9 @@ def create_supplement_apkg(
     """Generate a supplementary APKG file for import into Anki.
 
     Args:
-        notes_data: List of dicts with keys: front, back, example, comment
+        notes_data: Dicts with keys: front, back, example, comment,
+            collocations, etymology (optionally guid). Any iterable works;
+            notes are added as they are produced.
         output_path: Where to write the .apkg file.
         tags: Optional list of tags to apply to all notes.
         deck_name: Custom deck name (defaults to DECK_NAME).
@@ -149,25 +252,19 @@ def create_supplement_apkg(
     Returns:
         Path to the generated .apkg file.
     """
+    import genanki
+
     model = get_anki_model()
     deck = genanki.Deck(deck_id or DECK_ID, deck_name or DECK_NAME)
+    note_tags = tags or []
 
     for data in notes_data:
         note = genanki.Note(
             model=model,
-            fields=[
-                data.get("front", ""),
-                data.get("back", ""),
-                data.get("example", ""),
-                data.get("comment", ""),
-                data.get("collocations", ""),
-                data.get("etymology", ""),
-            ],
-            tags=tags or [],
+            fields=[data.get(key, "") for key in _NOTE_KEYS],
+            tags=note_tags,
             guid=data.get("guid"),
         )
         deck.add_note(note)
 
-    output_path = Path(output_path)
-    genanki.Package(deck).write_to_file(str(output_path))
-    return output_path
+    return write_package(genanki.Package(deck), output_path)
@@ -1,13 +1,29 @@
 """Card cache — persists generated card data to avoid redundant API calls."""
+import asyncio
 import json
 import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from .claude_generator import GeneratedCard
-from .config import DEFAULT_MODEL
+from .config import DEFAULT_CONCURRENCY, DEFAULT_MODEL
 from .matcher import normalize_greek
+from .sqlite_utils import select_in_chunks
+
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional (pip install greek-anki[fast])
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+    _json_loads = json.loads
 
 _SCHEMA = """\
 CREATE TABLE IF NOT EXISTS card_cache (
@@ -17,16 +33,47 @@ CREATE TABLE IF NOT EXISTS card_cache (
     model           TEXT NOT NULL,
     created_at      TEXT NOT NULL,
     updated_at      TEXT NOT NULL
-);
+) WITHOUT ROWID;
 """
 
+_COLUMNS = "word_normalized, word_original, card_json, model, created_at, updated_at"
+
+
+def _migrate_schema(conn: sqlite3.Connection) -> None:
+    """Rebuild a pre-existing rowid card_cache table as WITHOUT ROWID."""
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type='table' AND name='card_cache'"
+    ).fetchone()
+    if row is None or "WITHOUT ROWID" in row[0].upper():
+        return
+    conn.executescript(
+        "BEGIN;"
+        "ALTER TABLE card_cache RENAME TO card_cache_old;"
+        + _SCHEMA
+        + f"INSERT INTO card_cache ({_COLUMNS}) SELECT {_COLUMNS} FROM card_cache_old;"
+        "DROP TABLE card_cache_old;"
+        "COMMIT;"
+    )
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+# Bump when GeneratedCard.render_fields() output changes so cached HTML
+# from older versions is re-rendered instead of reused
+_RENDER_VERSION = 1
+_RENDERED_FIELDS = ("front", "example", "comment", "collocations_html", "etymology_html")
+
+
 def _dict_to_card(data: dict) -> GeneratedCard:
-    """Reconstruct a GeneratedCard from cached JSON data."""
+    """Reconstruct a GeneratedCard from cached JSON data.
+
+    Uses the HTML stored under "_rendered" when it matches the current
+    render version; otherwise renders from the structured data.
+    """
+    data = dict(data)
+    rendered = data.pop("_rendered", None)
     card = GeneratedCard(
         front_ru=data.get("front_ru", ""),
         front_en=data.get("front_en", ""),
@@ -39,10 +86,21 @@ def _dict_to_card(data: dict) -> GeneratedCard:
         collocations=data.get("collocations", []),
     )
     card._raw_data = data
-    card.render_fields()
+    if rendered and rendered.get("version") == _RENDER_VERSION:
+        for name in _RENDERED_FIELDS:
+            setattr(card, name, rendered[name])
+    else:
+        card.render_fields()
     return card
 
 
+def _with_rendered(card_data: dict) -> dict:
+    """Return card_data with its rendered HTML fields attached for caching."""
+    card = _dict_to_card(card_data)
+    rendered = {name: getattr(card, name) for name in _RENDERED_FIELDS}
+    return {**card._raw_data, "_rendered": {"version": _RENDER_VERSION, **rendered}}
+
+
 class CardCache:
     """SQLite-backed cache for generated card data."""
 
@@ -55,6 +113,14 @@ class CardCache:
             self._conn = sqlite3.connect(str(self.db_path))
             self._conn.row_factory = sqlite3.Row
             self._conn.execute("PRAGMA journal_mode=WAL")
+            # WAL + NORMAL only fsyncs at checkpoints; a crash can lose the
+            # last few commits but never corrupts the cache
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+            # 64 MiB page cache + memory-mapped reads for bulk lookups
+            self._conn.execute("PRAGMA cache_size=-65536")
+            self._conn.execute("PRAGMA mmap_size=268435456")
+            _migrate_schema(self._conn)
             self._conn.executescript(_SCHEMA)
             self._conn.commit()
         return self._conn
@@ -72,33 +138,92 @@ class CardCache:
 
     def store(self, word: str, card_data: dict, model: str) -> None:
         """Upsert a card into the cache."""
+        self.store_many([(word, card_data, model)])
+
+    def store_many(self, items: List[Tuple[str, dict, str]]) -> None:
+        """Upsert (word, card_data, model) items in a single transaction."""
+        self._store_rows(
+            [(normalize_greek(word), word, data, model) for word, data, model in items]
+        )
+
+    def store_norm(self, norm: str, word: str, card_data: dict, model: str) -> None:
+        """Upsert a card under an already-normalized key (see normalize_greek)."""
+        self._store_rows([(norm, word, card_data, model)])
+
+    def _store_rows(self, rows: List[Tuple[str, str, dict, str]]) -> None:
         conn = self._get_conn()
-        norm = normalize_greek(word)
         now = _now_iso()
-        data_json = json.dumps(card_data, ensure_ascii=False)
-        conn.execute(
-            "INSERT INTO card_cache (word_normalized, word_original, card_json, model, created_at, updated_at) "
+        conn.executemany(
+            f"INSERT INTO card_cache ({_COLUMNS}) "
             "VALUES (?, ?, ?, ?, ?, ?) "
             "ON CONFLICT(word_normalized) DO UPDATE SET "
             "card_json=excluded.card_json, model=excluded.model, updated_at=excluded.updated_at",
-            (norm, word, data_json, model, now, now),
+            [
+                (norm, word, _json_dumps(_with_rendered(card_data)), model, now, now)
+                for norm, word, card_data, model in rows
+            ],
         )
         conn.commit()
 
-    def get(self, word: str) -> Optional[dict]:
-        """Look up raw card data dict by word. Returns None if not cached."""
+    def _fetch(self, word: str) -> Optional[dict]:
+        """Return the stored JSON blob (including "_rendered") for a word."""
+        return self._fetch_norm(normalize_greek(word))
+
+    def _fetch_norm(self, norm: str) -> Optional[dict]:
         conn = self._get_conn()
-        norm = normalize_greek(word)
         row = conn.execute(
             "SELECT card_json FROM card_cache WHERE word_normalized=?", (norm,)
         ).fetchone()
         if row is None:
             return None
-        return json.loads(row["card_json"])
+        return _json_loads(row["card_json"])
+
+    def _select_by_norms(self, columns: str, norms: List[str]) -> Iterator[tuple]:
+        """SELECT columns for many normalized keys, in chunked IN (...) queries."""
+        yield from select_in_chunks(
+            self._get_conn(),
+            f"SELECT {columns} FROM card_cache "
+            "WHERE word_normalized IN ({placeholders})",
+            norms,
+        )
+
+    @staticmethod
+    def _group_by_norm(words: Iterable[str]) -> Dict[str, List[str]]:
+        by_norm: Dict[str, List[str]] = {}
+        for word in words:
+            by_norm.setdefault(normalize_greek(word), []).append(word)
+        return by_norm
+
+    def get_cached_words(self, words: Iterable[str]) -> Set[str]:
+        """Return the subset of words that have a cached card."""
+        by_norm = self._group_by_norm(words)
+        cached: Set[str] = set()
+        for (norm,) in self._select_by_norms("word_normalized", list(by_norm)):
+            cached.update(by_norm[norm])
+        return cached
+
+    def get_cards_bulk(self, words: Iterable[str]) -> Dict[str, GeneratedCard]:
+        """Look up many words at once. Returns word -> card for cached words."""
+        by_norm = self._group_by_norm(words)
+        cards: Dict[str, GeneratedCard] = {}
+        for norm, card_json in self._select_by_norms(
+            "word_normalized, card_json", list(by_norm)
+        ):
+            data = _json_loads(card_json)
+            for word in by_norm[norm]:
+                cards[word] = _dict_to_card(data)
+        return cards
+
+    def get(self, word: str) -> Optional[dict]:
+        """Look up raw card data dict by word. Returns None if not cached."""
+        data = self._fetch(word)
+        if data is not None:
+            data.pop("_rendered", None)
+        return data
 
     def get_card(self, word: str) -> Optional[GeneratedCard]:
         """Look up and reconstruct a full GeneratedCard from cache."""
-        data = self.get(word)
+        data = self._fetch(word)
         if data is None:
             return None
         return _dict_to_card(data)
@@ -124,13 +249,89 @@ def generate_card_cached(
 
     If force=True, always calls the API and updates the cache.
     """
+    norm = normalize_greek(word)
     if not force:
-        cached = cache.get_card(word)
-        if cached is not None:
-            return cached
+        data = cache._fetch_norm(norm)
+        if data is not None:
+            card = _dict_to_card(data)
+            card._from_cache = True
+            return card
 
     from .claude_generator import generate_card
 
     card = generate_card(word, model=model)
-    cache.store(word, card._raw_data, model=model)
+    cache.store_norm(norm, word, card._raw_data, model=model)
     return card
+
+
+def prefetch_cards(
+    words: List[str],
+    cache: CardCache,
+    model: str = DEFAULT_MODEL,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    min_interval: float = 0.0,
+) -> Dict[str, Exception]:
+    """Generate and cache cards for all uncached words concurrently.
+
+    API calls run in parallel (at most `concurrency` in flight, and starts
+    spaced at least `min_interval` seconds apart); cache writes stay on the
+    calling thread. Afterwards generate_card_cached serves these words
+    from the cache.
+
+    Returns a dict of word -> exception for words that failed.
+    Raises ValueError if concurrency is below 1, and RuntimeError if there
+    is work to do but no API key.
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    words = list(dict.fromkeys(words))
+    cached = cache.get_cached_words(words)
+    missing = [w for w in words if w not in cached]
+    if not missing:
+        return {}
+
+    from .claude_generator import _require_api_key
+
+    api_key = _require_api_key()
+    return asyncio.run(
+        _prefetch_async(missing, cache, model, concurrency, min_interval, api_key)
+    )
+
+
+async def _prefetch_async(
+    words: List[str],
+    cache: CardCache,
+    model: str,
+    concurrency: int,
+    min_interval: float,
+    api_key: str,
+) -> Dict[str, Exception]:
+    from anthropic import AsyncAnthropic
+
+    from .claude_generator import generate_card_async
+
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(concurrency)
+    pacer = asyncio.Lock()
+    next_start = loop.time()
+    errors: Dict[str, Exception] = {}
+
+    async def one(word: str, client: AsyncAnthropic) -> None:
+        nonlocal next_start
+        async with sem:
+            if min_interval > 0:
+                async with pacer:
+                    wait = next_start - loop.time()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    next_start = loop.time() + min_interval
+            try:
+                card = await generate_card_async(word, client, model=model)
+            except Exception as e:
+                errors[word] = e
+                return
+        cache.store(word, card._raw_data, model=model)
+
+    async with AsyncAnthropic(api_key=api_key) as client:
+        await asyncio.gather(*(one(w, client) for w in words))
+    return errors
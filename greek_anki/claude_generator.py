@@ -1,18 +1,27 @@
 """Claude API card generation."""
+import functools
 import html
 import json
 import os
+import re
 from dataclasses import dataclass, field
 from typing import List, Optional
 
 import keyring
-from anthropic import Anthropic
+from anthropic import Anthropic, AsyncAnthropic
 
 from .config import DEFAULT_MODEL, PROMPT_TEMPLATE_PATH
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional (pip install greek-anki[fast])
+    _json_loads = json.loads
+
 KEYRING_SERVICE = "greek-anki"
 KEYRING_USERNAME = "anthropic-api-key"
 
+_EM_TAG_RE = re.compile(r"(</?em>)")
+
 
 def get_api_key() -> Optional[str]:
     """Resolve API key: keyring first, then env var."""
@@ -60,18 +69,16 @@ class GeneratedCard:
     _usage: dict = field(default_factory=dict, repr=False)
     # Raw JSON data from Claude (for cache serialization)
     _raw_data: dict = field(default_factory=dict, repr=False)
+    # True when generate_card_cached served this card without an API call
+    _from_cache: bool = field(default=False, repr=False)
 
     @staticmethod
     def _sanitize_example_greek(text: str) -> str:
         """Allow only <em>/<em> tags in Greek examples, escape everything else."""
-        import re
-        # Temporarily replace valid <em> and </em> with placeholders
-        text = text.replace("<em>", "\x00EM\x00").replace("</em>", "\x00/EM\x00")
-        # Escape any remaining HTML
-        text = html.escape(text)
-        # Restore <em> tags
-        text = text.replace("\x00EM\x00", "<em>").replace("\x00/EM\x00", "</em>")
-        return text
+        # split() with a capturing group puts the tags at odd indices
+        parts = _EM_TAG_RE.split(text)
+        parts[::2] = [html.escape(p) for p in parts[::2]]
+        return "".join(parts)
 
     def render_fields(self):
         """Convert structured data into HTML fields matching Anki format."""
@@ -85,12 +92,11 @@ class GeneratedCard:
         )
 
         # Example field
-        example_lines = []
-        for ex in self.examples:
-            example_lines.append(
-                f"<li><strong>{self._sanitize_example_greek(ex.get('greek', ''))}</strong> {esc(ex.get('russian', ''))}</li>"
-            )
-        self.example = "\n".join(example_lines)
+        sanitize = self._sanitize_example_greek
+        self.example = "\n".join([
+            f"<li><strong>{sanitize(ex.get('greek', ''))}</strong> {esc(ex.get('russian', ''))}</li>"
+            for ex in self.examples
+        ])
 
         # Comment field
         comment_parts = []
@@ -100,20 +106,20 @@ class GeneratedCard:
             comment_parts.append("<div><br></div>")
 
         if self.synonyms:
-            syn_lines = []
-            for syn in self.synonyms:
-                syn_lines.append(
-                    f"<li><strong>{esc(syn.get('word', ''))}</strong>: "
-                    f"{esc(syn.get('distinction', ''))}</li>"
-                )
-            comment_parts.append("<div>" + "\n".join(syn_lines) + "</div>")
+            syn_html = "\n".join([
+                f"<li><strong>{esc(syn.get('word', ''))}</strong>: "
+                f"{esc(syn.get('distinction', ''))}</li>"
+                for syn in self.synonyms
+            ])
+            comment_parts.append(f"<div>{syn_html}</div>")
 
         self.comment = "\n".join(comment_parts)
 
         # Collocations field
         if self.collocations:
-            colloc_lines = [f"<li><strong>{esc(c)}</strong></li>" for c in self.collocations]
-            self.collocations_html = "".join(colloc_lines)
+            self.collocations_html = "".join(
+                [f"<li><strong>{esc(c)}</strong></li>" for c in self.collocations]
+            )
 
         # Etymology field
         if self.etymology_note:
@@ -133,36 +139,30 @@ class GeneratedCard:
         }
 
 
-import re as _re
-
-_JSON_FENCE_RE = _re.compile(r"```(?:json)?\s*\n(.*?)```", _re.DOTALL)
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*\n(.*?)```", re.DOTALL)
+_JSON_DECODER = json.JSONDecoder()
 
 
 def _extract_json(text: str, word: str) -> dict:
     """Extract a JSON object from Claude's response, tolerating extra text."""
-    # 1. Try fenced code block
-    m = _JSON_FENCE_RE.search(text)
+    # 1. Try fenced code block (the prompt asks for bare JSON, so usually absent)
+    m = _JSON_FENCE_RE.search(text) if "```" in text else None
     if m:
         try:
-            return json.loads(m.group(1))
+            return _json_loads(m.group(1))
         except json.JSONDecodeError:
             pass
 
-    # 2. Find the outermost { ... } in the response
+    # 2. Decode the first { ... } in the response, ignoring trailing text.
+    # raw_decode finds the end of the object itself, so braces inside
+    # string values can't throw off the match.
     start = text.find("{")
     if start != -1:
-        # Walk forward counting braces to find the matching close
-        depth = 0
-        for i in range(start, len(text)):
-            if text[i] == "{":
-                depth += 1
-            elif text[i] == "}":
-                depth -= 1
-                if depth == 0:
-                    try:
-                        return json.loads(text[start : i + 1])
-                    except json.JSONDecodeError:
-                        break
+        try:
+            obj, _end = _JSON_DECODER.raw_decode(text, start)
+            return obj
+        except json.JSONDecodeError:
+            pass
 
     raise ValueError(
         f"Could not extract JSON from Claude's response for '{word}':\n"
@@ -170,6 +170,7 @@ def _extract_json(text: str, word: str) -> dict:
     )
 
 
+@functools.lru_cache(maxsize=1)
 def _load_prompt_template() -> str:
     path = PROMPT_TEMPLATE_PATH
     if not path.exists():
@@ -177,21 +178,8 @@ def _load_prompt_template() -> str:
     return path.read_text(encoding="utf-8")
 
 
-def generate_card(
-    word: str,
-    model: str = DEFAULT_MODEL,
-    api_key: Optional[str] = None,
-) -> GeneratedCard:
-    """Generate a flashcard for a Greek word using Claude API.
-
-    Args:
-        word: Greek word to generate a card for.
-        model: Claude model to use.
-        api_key: Anthropic API key (defaults to ANTHROPIC_API_KEY env var).
-
-    Returns:
-        GeneratedCard with structured data and rendered HTML fields.
-    """
+def _require_api_key(api_key: Optional[str] = None) -> str:
+    """Return the given key or the stored one; raise if neither exists."""
     resolved_key = api_key or get_api_key()
     if not resolved_key:
         raise RuntimeError(
@@ -199,17 +187,22 @@ def generate_card(
             "  python -m greek_anki set-key\n"
             "Or set the ANTHROPIC_API_KEY environment variable."
         )
-    client = Anthropic(api_key=resolved_key)
+    return resolved_key
+
 
+def _message_params(word: str, model: str) -> dict:
+    """Build the messages.create() arguments for a word."""
     template = _load_prompt_template()
     prompt = template.replace("{word}", word)
+    return {
+        "model": model,
+        "max_tokens": 2048,
+        "messages": [{"role": "user", "content": prompt}],
+    }
 
-    response = client.messages.create(
-        model=model,
-        max_tokens=2048,
-        messages=[{"role": "user", "content": prompt}],
-    )
 
+def _card_from_response(response, word: str) -> GeneratedCard:
+    """Parse a Claude response into a rendered GeneratedCard."""
     raw_text = response.content[0].text.strip()
     data = _extract_json(raw_text, word)
 
@@ -232,3 +225,33 @@ def generate_card(
     }
 
     return card
+
+
+def generate_card(
+    word: str,
+    model: str = DEFAULT_MODEL,
+    api_key: Optional[str] = None,
+) -> GeneratedCard:
+    """Generate a flashcard for a Greek word using Claude API.
+
+    Args:
+        word: Greek word to generate a card for.
+        model: Claude model to use.
+        api_key: Anthropic API key (defaults to ANTHROPIC_API_KEY env var).
+
+    Returns:
+        GeneratedCard with structured data and rendered HTML fields.
+    """
+    client = Anthropic(api_key=_require_api_key(api_key))
+    response = client.messages.create(**_message_params(word, model))
+    return _card_from_response(response, word)
+
+
+async def generate_card_async(
+    word: str,
+    client: AsyncAnthropic,
+    model: str = DEFAULT_MODEL,
+) -> GeneratedCard:
+    """Async variant of generate_card using a shared AsyncAnthropic client."""
+    response = await client.messages.create(**_message_params(word, model))
+    return _card_from_response(response, word)
@@ -2,9 +2,9 @@
 import csv as csv_mod
 import os
 import random
-import re
 import sys
 import time
+from contextlib import closing, nullcontext
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -18,17 +18,45 @@ if sys.platform == "win32":
         sys.stderr.reconfigure(encoding="utf-8")
 
 import click
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    SpinnerColumn,
+    TextColumn,
+)
 from rich.prompt import Prompt
 from rich.table import Table
 
-import genanki
-
-from .anki_deck import AnkiNote, create_supplement_apkg, get_anki_model, read_apkg_notes
-from .config import DEFAULT_APKG, DEFAULT_CARD_CACHE, DEFAULT_FREQ_DB, DEFAULT_MODEL, DECK_ID, DECK_NAME
+from .anki_deck import (
+    AnkiNote,
+    create_supplement_apkg,
+    deck_id_from_name,
+    find_candidates,
+    get_anki_model,
+    iter_apkg_notes,
+    read_apkg_notes,
+    write_package,
+)
+from .config import (
+    DEFAULT_APKG,
+    DEFAULT_CARD_CACHE,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_FREQ_DB,
+    DEFAULT_MODEL,
+    DECK_ID,
+    DECK_NAME,
+)
 from .freq_list import IN_ANKI, SKIPPED, FreqDB
-from .matcher import find_note_by_word, freq_word_in_anki, normalize_greek
+from .matcher import (
+    build_token_index,
+    find_notes_by_words,
+    freq_word_in_index,
+    normalize_greek,
+    strip_html,
+)
 
 console = Console()
 
@@ -109,16 +137,15 @@ def sync(freq_db: str, apkg_path: str):
     notes = read_apkg_notes(apkg_path)
     console.print(f"  Found {len(notes)} notes")
 
-    back_fields = [n.back for n in notes]
+    token_index = build_token_index(n.back for n in notes)
 
     console.print("Matching against frequency list...")
     with FreqDB(freq_db) as db:
         pending = db.get_pending()
-        matched_words = []
-
-        for row in pending:
-            if freq_word_in_anki(row["greek"], back_fields):
-                matched_words.append(row["greek"])
+        matched_words = [
+            row["greek"] for row in pending
+            if freq_word_in_index(row["greek"], token_index)
+        ]
 
         if matched_words:
             count = db.mark_many_processed(
@@ -221,16 +248,16 @@ def skip(freq_db: str, words: tuple, reason: str):
 
 def _display_card_preview(card) -> None:
     """Display a generated card for interactive review."""
-    console.print(
+    panels = [
         Panel(
             f"[bold]{card.front_ru}[/bold]\n\n{card.front_en}",
             title="Front (translations)",
             border_style="blue",
         )
-    )
+    ]
 
     pos_line = f"\n[dim]{card.part_of_speech}[/dim]" if card.part_of_speech else ""
-    console.print(
+    panels.append(
         Panel(
             f"[bold]{card.back}[/bold]{pos_line}",
             title="Back (Greek)",
@@ -242,7 +269,7 @@ def _display_card_preview(card) -> None:
         lines = []
         for i, ex in enumerate(card.examples, 1):
             lines.append(f"{i}. {ex['greek']}\n   {ex['russian']}")
-        console.print(Panel("\n".join(lines), title="Examples", border_style="yellow"))
+        panels.append(Panel("\n".join(lines), title="Examples", border_style="yellow"))
 
     comment_parts = []
     if card.conjugation:
@@ -253,12 +280,12 @@ def _display_card_preview(card) -> None:
             comment_parts.append(f"  \u2022 {syn['word']}: {syn['distinction']}")
 
     if comment_parts:
-        console.print(
+        panels.append(
             Panel("\n".join(comment_parts), title="Comment", border_style="magenta")
         )
 
     if card.collocations:
-        console.print(
+        panels.append(
             Panel(
                 "\n".join(f"\u2022 {c}" for c in card.collocations),
                 title="Collocations",
@@ -267,21 +294,109 @@ def _display_card_preview(card) -> None:
         )
 
     if card.etymology_note:
-        console.print(
+        panels.append(
             Panel(card.etymology_note, title="Etymology", border_style="dim")
         )
 
+    # One render pass and one terminal write for the whole card
+    console.print(Group(*panels))
+
+
+def _iter_with_progress(items: list, label, enabled: bool):
+    """Yield (i, item) pairs, 1-based.
+
+    When enabled, shows a single-line progress bar described by label(item)
+    instead of relying on per-item banners; used for --no-review runs.
+    """
+    if not enabled:
+        yield from enumerate(items, 1)
+        return
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        console=console,
+    ) as progress:
+        task = progress.add_task("", total=len(items))
+        for i, item in enumerate(items, 1):
+            progress.update(task, description=label(item))
+            yield i, item
+            progress.advance(task)
+
+
+def _unique_words(words) -> tuple:
+    """Drop words whose normalized form was already given, keeping the first."""
+    seen = set()
+    unique = []
+    for word in words:
+        norm = normalize_greek(word)
+        if norm not in seen:
+            seen.add(norm)
+            unique.append(word)
+    return tuple(unique)
+
+
+_REVIEW_KEYS = {"a": "accept", "r": "regenerate", "s": "skip"}
+
 
 def _interactive_review(card, word: str) -> str:
-    """Show card and prompt for action. Returns action string."""
+    """Show card and prompt for action. Returns action string.
+
+    On a terminal this reads a single keypress (Enter accepts, other keys
+    are ignored); with piped stdin or no usable terminal it falls back to
+    a line-based prompt so scripted answers still work.
+    """
     _display_card_preview(card)
     console.print()
-    action = Prompt.ask(
-        "[bold]Action[/bold]  [a]ccept / [r]egenerate / [s]kip",
-        choices=["a", "r", "s"],
-        default="a",
-    )
-    return {"a": "accept", "r": "regenerate", "s": "skip"}[action]
+    prompt = "[bold]Action[/bold]  \\[a]ccept / \\[r]egenerate / \\[s]kip"
+    if sys.stdin.isatty():
+        console.print(f"{prompt} (a): ", end="")
+        try:
+            while True:
+                key = click.getchar().lower()
+                if key in ("\r", "\n"):
+                    key = "a"
+                if key in _REVIEW_KEYS:
+                    break
+        except OSError:
+            # isatty() but /dev/tty cannot be opened (e.g. detached session)
+            console.print()
+        else:
+            console.print(key)
+            return _REVIEW_KEYS[key]
+    key = Prompt.ask(prompt, choices=list(_REVIEW_KEYS), default="a")
+    return _REVIEW_KEYS[key]
+
+
+def _generate_and_review(word: str, generate, no_review: bool) -> tuple:
+    """Run the generate/review loop shared by add and refresh.
+
+    generate(force) returns a card; force is True once the user has asked
+    to regenerate. Returns (card, action): the card and "accept", None and
+    "skip", or None and "" when attempts run out.
+    """
+    force = False
+    for _attempt in range(3):
+        console.print(f"Generating card for [bold]{word}[/bold]...")
+        try:
+            card = generate(force)
+        except Exception as e:
+            console.print(f"[red]Error: {e}[/red]")
+            continue
+
+        action = "accept" if no_review else _interactive_review(card, word)
+        if action == "accept":
+            return card, action
+        if action == "skip":
+            console.print("[yellow]Skipped.[/yellow]")
+            return None, action
+        console.print("[dim]Regenerating...[/dim]")
+        force = True  # bypass cache on regenerate
+
+    console.print("[red]Max attempts reached, skipping.[/red]")
+    return None, ""
 
 
 @cli.command()
@@ -294,7 +409,14 @@ def _interactive_review(card, word: str) -> str:
               help="Card cache database path")
 @click.option("--model", default=DEFAULT_MODEL, help="Claude model to use")
 @click.option("--no-review", is_flag=True, help="Skip interactive review")
-def add(words: tuple, freq_db: str, apkg: str, cache_path: str, model: str, no_review: bool):
+@click.option("--concurrency", "-j", type=click.IntRange(min=1),
+              default=DEFAULT_CONCURRENCY,
+              help="Max parallel API requests when generating several words "
+                   "(with --no-review)")
+def add(
+    words: tuple, freq_db: str, apkg: str, cache_path: str, model: str,
+    no_review: bool, concurrency: int,
+):
     """Add one or more words: generate via Claude, review, and create APKG.
 
     \b
@@ -303,20 +425,48 @@ def add(words: tuple, freq_db: str, apkg: str, cache_path: str, model: str, no_r
       python -m greek_anki add αίτηση πρόταση κίνηση
       python -m greek_anki add αίτηση --apkg AZ_greek_words.apkg --freq-db freq_list.sq3
     """
-    from .card_cache import CardCache, generate_card_cached
-    import genanki
+    from .card_cache import CardCache, generate_card_cached, prefetch_cards
+
+    words = _unique_words(words)
+    now = datetime.now()
+    month_tag = f"added::{now.strftime('%Y-%m')}"
 
     # Load existing deck for duplicate checking (optional)
-    back_fields = []
+    duplicates = set()
     if apkg:
         console.print(f"Reading deck: {apkg}...")
         notes = read_apkg_notes(apkg)
-        back_fields = [n.back for n in notes]
+        token_index = build_token_index(n.back for n in notes)
         console.print(f"  {len(notes)} existing notes loaded for duplicate check")
+        duplicates = {w for w in words if freq_word_in_index(w, token_index)}
 
     accepted_cards: list = []  # [(GeneratedCard, word, tags)]
+    marks: list = []  # [(word, status, notes)] for the freq DB, written in one go
+
+    freq = FreqDB(freq_db) if freq_db else nullcontext()
+    with CardCache(cache_path) as cache, freq as db:
+        ranks = db.get_ranks_bulk(words) if freq_db else {}
+
+        # Without review, generate uncached cards in parallel up front; the
+        # loop below then reads them from the cache. Interactive review
+        # keeps generating on demand so quitting or skipping costs nothing.
+        cached = cache.get_cached_words(words)
+        uncached = [w for w in words if w not in duplicates and w not in cached]
+        if no_review and len(uncached) > 1:
+            console.print(
+                f"Generating {len(uncached)} cards "
+                f"(up to {concurrency} in parallel)..."
+            )
+            try:
+                failed = prefetch_cards(
+                    uncached, cache, model=model, concurrency=concurrency
+                )
+            except RuntimeError as e:
+                console.print(f"[red]Error: {e}[/red]")
+            else:
+                for w, e in failed.items():
+                    console.print(f"[red]Error generating {w}: {e}[/red]")
 
-    with CardCache(cache_path) as cache:
         for i, word in enumerate(words, 1):
             console.print(
                 f"\n[bold]\u2500\u2500 [{i}/{len(words)}] {word} \u2500\u2500[/bold]"
@@ -324,104 +474,59 @@ def add(words: tuple, freq_db: str, apkg: str, cache_path: str, model: str, no_r
 
             # Show frequency rank if available
             if freq_db:
-                with FreqDB(freq_db) as db:
-                    freq_row = db.get_word_by_greek(word)
-                    if freq_row:
-                        console.print(f"  Frequency rank: [cyan]{freq_row['rank']}[/cyan]")
-                    else:
-                        console.print(f"  [dim]Not in frequency list[/dim]")
+                if word in ranks:
+                    console.print(f"  Frequency rank: [cyan]{ranks[word]}[/cyan]")
+                else:
+                    console.print(f"  [dim]Not in frequency list[/dim]")
 
             # Duplicate check
-            if back_fields and freq_word_in_anki(word, back_fields):
+            if word in duplicates:
                 console.print(f"[yellow]Already in deck, skipping.[/yellow]")
                 if freq_db:
-                    with FreqDB(freq_db) as db:
-                        db.mark_processed(word, status=IN_ANKI, notes="already in deck")
+                    marks.append((word, IN_ANKI, "already in deck"))
                 continue
 
             # Generate with retry loop
-            card = None
-            force = False
-            for _attempt in range(3):
-                console.print(f"Generating card for [bold]{word}[/bold]...")
-                try:
-                    card = generate_card_cached(word, cache, model=model, force=force)
-                except Exception as e:
-                    console.print(f"[red]Error: {e}[/red]")
-                    continue
-
-                if no_review:
-                    action = "accept"
-                else:
-                    action = _interactive_review(card, word)
-
-                if action == "accept":
-                    break
-                elif action == "regenerate":
-                    console.print("[dim]Regenerating...[/dim]")
-                    force = True  # bypass cache on regenerate
-                    continue
-                elif action == "skip":
-                    console.print("[yellow]Skipped.[/yellow]")
-                    if freq_db:
-                        with FreqDB(freq_db) as db:
-                            db.mark_processed(word, status=SKIPPED, notes="skipped during add")
-                    card = None
-                    break
-            else:
-                console.print("[red]Max attempts reached, skipping.[/red]")
-                card = None
-
+            card, action = _generate_and_review(
+                word,
+                lambda force: generate_card_cached(word, cache, model=model, force=force),
+                no_review,
+            )
+            if action == "skip" and freq_db:
+                marks.append((word, SKIPPED, "skipped during add"))
             if card is None:
                 continue
 
             # Build per-word tags
             tags = [
                 "auto-generated",
-                f"added::{datetime.now().strftime('%Y-%m')}",
+                month_tag,
                 f"pos::{card.part_of_speech}",
             ]
-            if freq_db:
-                with FreqDB(freq_db) as db:
-                    freq_row = db.get_word_by_greek(word)
-                    if freq_row:
-                        rank = freq_row["rank"]
-                        rs = ((rank - 1) // 500) * 500 + 1
-                        tags.append(f"freq::{rs}-{rs + 499}")
+            if word in ranks:
+                rs = ((ranks[word] - 1) // 500) * 500 + 1
+                tags.append(f"freq::{rs}-{rs + 499}")
 
             accepted_cards.append((card, word, tags))
 
-    # Write all accepted cards to one APKG
+        # Write all accepted cards to one APKG
+        if accepted_cards:
+            timestamp = now.strftime("%Y-%m-%d_%H%M%S")
+            output_name = f"AZ_update_{timestamp}.apkg"
+            output_path = _create_batch_apkg(accepted_cards, output_name)
+            if freq_db:
+                marks.extend(
+                    (word, IN_ANKI, f"added -> {output_name}")
+                    for _card, word, _tags in accepted_cards
+                )
+
+        if marks:
+            db.mark_processed_many(marks)
+
     if not accepted_cards:
         console.print("\n[yellow]No cards to write.[/yellow]")
         return
 
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
-    output_name = f"AZ_update_{timestamp}.apkg"
-
-    model_obj = get_anki_model()
-    deck = genanki.Deck(DECK_ID, DECK_NAME)
-    for card, _word, tags in accepted_cards:
-        nd = card.to_note_dict()
-        note = genanki.Note(
-            model=model_obj,
-            fields=[
-                nd["front"], nd["back"], nd["example"], nd["comment"],
-                nd["collocations"], nd["etymology"],
-            ],
-            tags=tags,
-        )
-        deck.add_note(note)
-
-    output_path = Path(output_name)
-    genanki.Package(deck).write_to_file(str(output_path))
-
-    # Mark all as processed in freq DB
-    if freq_db:
-        with FreqDB(freq_db) as db:
-            for card, word, _ in accepted_cards:
-                db.mark_processed(word, status=IN_ANKI, notes=f"added -> {output_name}")
-
     console.print(f"\n[bold green]Done! {len(accepted_cards)} card(s) created.[/bold green]")
     console.print(f"  Import [cyan]{output_path}[/cyan] into Anki")
 
@@ -453,23 +558,22 @@ def _create_batch_apkg(cards_with_tags: list, output_path: str) -> Path:
     import genanki
 
     model = get_anki_model()
-    deck = genanki.Deck(DECK_ID, DECK_NAME)
+    note_dicts = [card.to_note_dict() for card, _word, _tags in cards_with_tags]
 
-    for card, _word, tags in cards_with_tags:
-        nd = card.to_note_dict()
-        note = genanki.Note(
-            model=model,
-            fields=[
-                nd["front"], nd["back"], nd["example"], nd["comment"],
-                nd["collocations"], nd["etymology"],
-            ],
-            tags=tags,
+    deck = genanki.Deck(DECK_ID, DECK_NAME)
+    for nd, (_card, _word, tags) in zip(note_dicts, cards_with_tags):
+        deck.add_note(
+            genanki.Note(
+                model=model,
+                fields=[
+                    nd["front"], nd["back"], nd["example"], nd["comment"],
+                    nd["collocations"], nd["etymology"],
+                ],
+                tags=tags,
+            )
         )
-        deck.add_note(note)
 
-    output_path = Path(output_path)
-    genanki.Package(deck).write_to_file(str(output_path))
-    return output_path
+    return write_package(genanki.Package(deck), output_path)
 
 
 @cli.command("add-batch")
@@ -480,11 +584,16 @@ def _create_batch_apkg(cards_with_tags: list, output_path: str) -> Path:
 @click.option("--cache", "cache_path", type=click.Path(), default=DEFAULT_CARD_CACHE,
               help="Card cache database path")
 @click.option("--model", default=DEFAULT_MODEL)
-@click.option("--delay", type=float, default=0.5, help="Delay between API calls (s)")
+@click.option("--delay", type=float, default=0.5,
+              help="Minimum spacing between API request starts (s)")
 @click.option("--no-review", is_flag=True, help="Skip interactive review")
 @click.option("--yes", "-y", is_flag=True, help="Skip cost estimation prompt")
+@click.option("--concurrency", "-j", type=click.IntRange(min=1),
+              default=DEFAULT_CONCURRENCY,
+              help="Max parallel API requests (with --no-review)")
 def add_batch(
-    freq_db, apkg_path, rank_range, count, cache_path, model, delay, no_review, yes
+    freq_db, apkg_path, rank_range, count, cache_path, model, delay, no_review, yes,
+    concurrency,
 ):
     """Add N random pending words from frequency list via Claude API.
 
@@ -497,8 +606,9 @@ def add_batch(
       python -m greek_anki add-batch freq_list.sq3 deck.apkg -n 10 --range 1 500
       python -m greek_anki add-batch freq_list.sq3 deck.apkg -n 50 --no-review -y
     """
-    from .card_cache import CardCache, generate_card_cached
+    from .card_cache import CardCache, generate_card_cached, prefetch_cards
 
+    now = datetime.now()
     range_start = rank_range[0] if rank_range else None
     range_end = rank_range[1] if rank_range else None
 
@@ -522,7 +632,8 @@ def add_batch(
 
     # Count how many are already cached (no API cost)
     with CardCache(cache_path) as cache:
-        cached_count = sum(1 for row in selected if cache.get(row["greek"]) is not None)
+        cached = cache.get_cached_words(row["greek"] for row in selected)
+    cached_count = sum(1 for row in selected if row["greek"] in cached)
     api_count = len(selected) - cached_count
 
     # Cost estimation
@@ -541,43 +652,86 @@ def add_batch(
     # Duplicate check against existing deck
     console.print(f"Reading existing deck: {apkg_path}...")
     notes = read_apkg_notes(apkg_path)
-    back_fields = [n.back for n in notes]
+    token_index = build_token_index(n.back for n in notes)
+    duplicates = {
+        row["greek"] for row in selected
+        if freq_word_in_index(row["greek"], token_index)
+    }
 
     accepted_cards: list = []
     tags_base = [
         "auto-generated",
-        f"added::{datetime.now().strftime('%Y-%m')}",
+        f"added::{now.strftime('%Y-%m')}",
         "source::batch",
     ]
 
+    marks: list = []  # [(word, status, notes)] for the freq DB, written in one go
+
     with CardCache(cache_path) as cache:
-        for i, row in enumerate(selected, 1):
+        # Without review, generate all uncached cards in parallel up front;
+        # the loop below then reads them from the cache. Interactive review
+        # keeps generating on demand so quitting or skipping costs nothing.
+        uncached = [
+            row["greek"] for row in selected
+            if row["greek"] not in duplicates and row["greek"] not in cached
+        ]
+        if no_review and uncached:
+            console.print(
+                f"Generating {len(uncached)} cards "
+                f"(up to {concurrency} in parallel)..."
+            )
+            try:
+                failed = prefetch_cards(
+                    uncached, cache, model=model,
+                    concurrency=concurrency, min_interval=delay,
+                )
+            except RuntimeError as e:
+                console.print(f"[red]Error: {e}[/red]")
+            else:
+                for w, e in failed.items():
+                    console.print(f"[red]Error generating {w}: {e}[/red]")
+
+        rows = _iter_with_progress(
+            selected, lambda row: f"{row['greek']} (rank {row['rank']})", no_review
+        )
+        for i, row in rows:
             word = row["greek"]
             rank = row["rank"]
 
-            console.print(
-                f"\n[bold]\u2500\u2500 [{i}/{len(selected)}] {word} (rank {rank}) \u2500\u2500[/bold]"
-            )
+            if not no_review:
+                console.print(
+                    f"\n[bold]\u2500\u2500 [{i}/{len(selected)}] {word} (rank {rank}) \u2500\u2500[/bold]"
+                )
 
-            if freq_word_in_anki(word, back_fields):
+            if word in duplicates:
                 console.print("[yellow]Already in deck, skipping[/yellow]")
-                with FreqDB(freq_db) as db:
-                    db.mark_processed(
-                        word, status=IN_ANKI, notes="sync: found during batch"
-                    )
+                marks.append((word, IN_ANKI, "sync: found during batch"))
                 continue
 
+            started = time.monotonic()
             try:
                 card = generate_card_cached(word, cache, model=model)
             except Exception as e:
                 console.print(f"[red]Error generating card: {e}[/red]")
                 continue
+            called_api = not card._from_cache
 
             if no_review:
                 action = "accept"
             else:
                 action = _interactive_review(card, word)
 
+            # A single regeneration, then a yes/no on the new version
+            if action == "regenerate":
+                called_api = True
+                try:
+                    card = generate_card_cached(word, cache, model=model, force=True)
+                    _display_card_preview(card)
+                    action = "accept" if click.confirm("Accept this version?") else ""
+                except Exception as e:
+                    console.print(f"[red]Regeneration failed: {e}[/red]")
+                    action = ""
+
             if action == "accept":
                 rs = ((rank - 1) // 500) * 500 + 1
                 card_tags = tags_base + [
@@ -586,48 +740,39 @@ def add_batch(
                 ]
                 accepted_cards.append((card, word, card_tags))
             elif action == "skip":
-                with FreqDB(freq_db) as db:
-                    db.mark_processed(
-                        word, status=SKIPPED, notes="skipped during batch"
-                    )
-            elif action == "regenerate":
-                try:
-                    card = generate_card_cached(word, cache, model=model, force=True)
-                    _display_card_preview(card)
-                    if click.confirm("Accept this version?"):
-                        rs = ((rank - 1) // 500) * 500 + 1
-                        card_tags = tags_base + [
-                            f"pos::{card.part_of_speech}",
-                            f"freq::{rs}-{rs + 499}",
-                        ]
-                        accepted_cards.append((card, word, card_tags))
-                except Exception as e:
-                    console.print(f"[red]Regeneration failed: {e}[/red]")
+                marks.append((word, SKIPPED, "skipped during batch"))
 
-            if i < len(selected):
-                time.sleep(delay)
+            # Space API calls at least `delay` apart; time spent generating
+            # or reviewing already counts, and cache hits need no pause
+            if i < len(selected) and called_api:
+                time.sleep(max(0.0, delay - (time.monotonic() - started)))
 
     if accepted_cards:
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+        timestamp = now.strftime("%Y-%m-%d_%H%M%S")
         output_name = f"AZ_batch_{timestamp}.apkg"
         output_path = _create_batch_apkg(accepted_cards, output_name)
+        marks.extend(
+            (word, IN_ANKI, f"batch add -> {output_name}")
+            for _card, word, _tags in accepted_cards
+        )
 
+    if marks:
         with FreqDB(freq_db) as db:
-            for card, word, _ in accepted_cards:
-                db.mark_processed(
-                    word, status=IN_ANKI, notes=f"batch add -> {output_name}"
-                )
+            db.mark_processed_many(marks)
 
-        console.print(f"\n[bold green]Batch complete![/bold green]")
-        console.print(f"  Cards created: {len(accepted_cards)}")
-        console.print(f"  Import [cyan]{output_path}[/cyan] into Anki")
-    else:
+    if not accepted_cards:
         console.print("\n[yellow]No cards were accepted.[/yellow]")
+        return
+
+    console.print(f"\n[bold green]Batch complete![/bold green]")
+    console.print(f"  Cards created: {len(accepted_cards)}")
+    console.print(f"  Import [cyan]{output_path}[/cyan] into Anki")
 
 
 @cli.command()
 @click.argument("apkg_path", type=click.Path(exists=True))
-@click.option("--limit", "-n", type=int, default=10, help="Number of cards to enrich")
+@click.option("--limit", "-n", type=click.IntRange(min=1), default=10,
+              help="Number of cards to enrich")
 @click.option("--model", default=DEFAULT_MODEL)
 @click.option("--delay", type=float, default=0.5)
 @click.option("--no-review", is_flag=True)
@@ -639,88 +784,97 @@ def enrich(apkg_path: str, limit: int, model: str, delay: float, no_review: bool
     """Backfill Collocations/Etymology (default) or all fields (--full) for existing cards."""
     from .card_cache import CardCache, generate_card_cached
 
-    console.print(f"Reading APKG: {apkg_path}...")
-    notes = read_apkg_notes(apkg_path)
+    now = datetime.now()
+    month_tag = f"added::{now.strftime('%Y-%m')}"
 
     if full:
         # Original mode: find cards with no Example AND no Comment
-        candidates = [
-            n for n in notes if not n.example.strip() and not n.comment.strip()
-        ]
+        def is_candidate(n: AnkiNote) -> bool:
+            return not n.example.strip() and not n.comment.strip()
+
         mode_label = "minimal cards (no Example or Comment)"
     else:
         # Default: find cards missing any enrichable field
-        candidates = [
-            n for n in notes
-            if not n.example.strip() or not n.comment.strip()
-            or not n.collocations.strip() or not n.etymology.strip()
-        ]
+        def is_candidate(n: AnkiNote) -> bool:
+            return (
+                not n.example.strip() or not n.comment.strip()
+                or not n.collocations.strip() or not n.etymology.strip()
+            )
+
         mode_label = "cards with empty fields"
 
-    console.print(f"  Found {len(candidates)} {mode_label}")
+    # Only scans the deck until `limit` candidates are found
+    console.print(f"Reading APKG: {apkg_path}...")
+    to_enrich = find_candidates(apkg_path, is_candidate, limit)
 
-    if not candidates:
+    if not to_enrich:
         console.print("[green]All cards already have content![/green]")
         return
 
-    to_enrich = candidates[:limit]
-    console.print(f"  Will enrich {len(to_enrich)} cards\n")
+    console.print(f"  Will enrich {len(to_enrich)} {mode_label}\n")
 
-    cache = CardCache("card_cache.sq3")
     enriched_cards = []
-    for i, note in enumerate(to_enrich, 1):
-        word_clean = re.sub(r"<[^>]+>", "", note.back).strip()
-
-        console.print(f"[bold]\u2500\u2500 [{i}/{len(to_enrich)}] {word_clean} \u2500\u2500[/bold]")
+    with CardCache(DEFAULT_CARD_CACHE) as cache:
+        notes = _iter_with_progress(
+            to_enrich, lambda n: strip_html(n.back).strip(), no_review
+        )
+        for i, note in notes:
+            word_clean = strip_html(note.back).strip()
 
-        try:
-            card = generate_card_cached(word_clean, cache, model=model)
-        except Exception as e:
-            console.print(f"[red]Error: {e}[/red]")
-            continue
+            if not no_review:
+                console.print(f"[bold]\u2500\u2500 [{i}/{len(to_enrich)}] {word_clean} \u2500\u2500[/bold]")
 
-        if not no_review:
-            _display_card_preview(card)
-            if not click.confirm("Accept enrichment?"):
+            started = time.monotonic()
+            try:
+                card = generate_card_cached(word_clean, cache, model=model)
+            except Exception as e:
+                console.print(f"[red]Error: {e}[/red]")
                 continue
 
-        if full:
-            # Replace all generated fields unconditionally
-            enriched_cards.append(
-                {
-                    "guid": note.guid,
-                    "front": note.front,
-                    "back": note.back,
-                    "example": card.example,
-                    "comment": card.comment,
-                    "collocations": card.collocations_html,
-                    "etymology": card.etymology_html,
-                }
-            )
-        else:
-            # Fill empty fields from generated data, keep existing content
-            enriched_cards.append(
-                {
-                    "guid": note.guid,
-                    "front": note.front,
-                    "back": note.back,
-                    "example": note.example if note.example.strip() else card.example,
-                    "comment": note.comment if note.comment.strip() else card.comment,
-                    "collocations": note.collocations if note.collocations.strip() else card.collocations_html,
-                    "etymology": note.etymology if note.etymology.strip() else card.etymology_html,
-                }
-            )
+            if not no_review:
+                _display_card_preview(card)
+                if not click.confirm("Accept enrichment?"):
+                    continue
+
+            if full:
+                # Replace all generated fields unconditionally
+                enriched_cards.append(
+                    {
+                        "guid": note.guid,
+                        "front": note.front,
+                        "back": note.back,
+                        "example": card.example,
+                        "comment": card.comment,
+                        "collocations": card.collocations_html,
+                        "etymology": card.etymology_html,
+                    }
+                )
+            else:
+                # Fill empty fields from generated data, keep existing content
+                enriched_cards.append(
+                    {
+                        "guid": note.guid,
+                        "front": note.front,
+                        "back": note.back,
+                        "example": note.example if note.example.strip() else card.example,
+                        "comment": note.comment if note.comment.strip() else card.comment,
+                        "collocations": note.collocations if note.collocations.strip() else card.collocations_html,
+                        "etymology": note.etymology if note.etymology.strip() else card.etymology_html,
+                    }
+                )
 
-        if i < len(to_enrich):
-            time.sleep(delay)
+            # Space API calls at least `delay` apart; time spent generating
+            # or reviewing already counts, and cache hits need no pause
+            if i < len(to_enrich) and not card._from_cache:
+                time.sleep(max(0.0, delay - (time.monotonic() - started)))
 
     if enriched_cards:
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+        timestamp = now.strftime("%Y-%m-%d_%H%M%S")
         output_name = f"AZ_enriched_{timestamp}.apkg"
         output_path = create_supplement_apkg(
             enriched_cards,
             output_name,
-            tags=["enriched", f"added::{datetime.now().strftime('%Y-%m')}"],
+            tags=["enriched", month_tag],
         )
         console.print(f"\n[bold green]Enrichment complete![/bold green]")
         console.print(f"  Cards enriched: {len(enriched_cards)}")
@@ -750,81 +904,66 @@ def refresh(words: tuple, apkg: str, model: str, no_review: bool):
     """
     from .card_cache import CardCache, generate_card_cached
 
+    words = _unique_words(words)
+    now = datetime.now()
+    month_tag = f"added::{now.strftime('%Y-%m')}"
+
     console.print(f"Reading APKG: {apkg}...")
-    notes = read_apkg_notes(apkg)
-    console.print(f"  {len(notes)} notes loaded")
+    with closing(iter_apkg_notes(apkg)) as notes:
+        matches = find_notes_by_words(words, notes)
 
-    cache = CardCache("card_cache.sq3")
     refreshed_cards = []
+    with CardCache(DEFAULT_CARD_CACHE) as cache:
 
-    for i, word in enumerate(words, 1):
-        console.print(
-            f"\n[bold]\u2500\u2500 [{i}/{len(words)}] {word} \u2500\u2500[/bold]"
-        )
-
-        note = find_note_by_word(word, notes)
-        if note is None:
-            console.print(f"[red]Not found in deck, skipping.[/red]")
-            continue
-
-        word_clean = re.sub(r"<[^>]+>", "", note.back).strip()
-        console.print(
-            f"Found: [cyan]{word_clean}[/cyan] (guid={note.guid})"
-        )
+        for i, word in enumerate(words, 1):
+            console.print(
+                f"\n[bold]\u2500\u2500 [{i}/{len(words)}] {word} \u2500\u2500[/bold]"
+            )
 
-        card = None
-        for _attempt in range(3):
-            console.print(f"Generating card for [bold]{word_clean}[/bold]...")
-            try:
-                card = generate_card_cached(word_clean, cache, model=model, force=True)
-            except Exception as e:
-                console.print(f"[red]Error: {e}[/red]")
+            note = matches[word]
+            if note is None:
+                console.print(f"[red]Not found in deck, skipping.[/red]")
                 continue
 
-            if no_review:
-                action = "accept"
-            else:
-                action = _interactive_review(card, word_clean)
+            word_clean = strip_html(note.back).strip()
+            console.print(
+                f"Found: [cyan]{word_clean}[/cyan] (guid={note.guid})"
+            )
 
-            if action == "accept":
-                break
-            elif action == "regenerate":
-                console.print("[dim]Regenerating...[/dim]")
+            # Refresh always bypasses the cache
+            card, _action = _generate_and_review(
+                word_clean,
+                lambda _force: generate_card_cached(
+                    word_clean, cache, model=model, force=True
+                ),
+                no_review,
+            )
+            if card is None:
                 continue
-            elif action == "skip":
-                console.print("[yellow]Skipped.[/yellow]")
-                card = None
-                break
-        else:
-            console.print("[red]Max attempts reached, skipping.[/red]")
-            card = None
-
-        if card is None:
-            continue
 
-        nd = card.to_note_dict()
-        refreshed_cards.append(
-            {
-                "guid": note.guid,
-                "front": nd["front"],
-                "back": note.back,  # preserve original Back field
-                "example": nd["example"],
-                "comment": nd["comment"],
-                "collocations": nd["collocations"],
-                "etymology": nd["etymology"],
-            }
-        )
+            nd = card.to_note_dict()
+            refreshed_cards.append(
+                {
+                    "guid": note.guid,
+                    "front": nd["front"],
+                    "back": note.back,  # preserve original Back field
+                    "example": nd["example"],
+                    "comment": nd["comment"],
+                    "collocations": nd["collocations"],
+                    "etymology": nd["etymology"],
+                }
+            )
 
     if not refreshed_cards:
         console.print("\n[yellow]No cards to write.[/yellow]")
         return
 
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+    timestamp = now.strftime("%Y-%m-%d_%H%M%S")
     output_name = f"AZ_refresh_{timestamp}.apkg"
     output_path = create_supplement_apkg(
         refreshed_cards,
         output_name,
-        tags=["refreshed", f"added::{datetime.now().strftime('%Y-%m')}"],
+        tags=["refreshed", month_tag],
     )
     console.print(f"\n[bold green]Refresh complete![/bold green]")
     console.print(f"  Cards refreshed: {len(refreshed_cards)}")
@@ -865,7 +1004,6 @@ def build_deck(
       python -m greek_anki build-deck freq_list.sq3 --range 1 3000 --deck-name "Greek Top 3000"
       python -m greek_anki build-deck freq_list.sq3 --range 1001 3000 --generate-missing -y
     """
-    from .anki_deck import deck_id_from_name
     from .card_cache import CardCache, generate_card_cached
 
     range_start, range_end = rank_range
@@ -898,15 +1036,10 @@ def build_deck(
     console.print(f"  Words in range: {len(all_words)}")
 
     # Check cache coverage
-    cached = []
-    missing = []
     with CardCache(cache_path) as cache:
-        for row in all_words:
-            card = cache.get_card(row["greek"])
-            if card is not None:
-                cached.append((row, card))
-            else:
-                missing.append(row)
+        found = cache.get_cards_bulk(row["greek"] for row in all_words)
+    cached = [(row, found[row["greek"]]) for row in all_words if row["greek"] in found]
+    missing = [row for row in all_words if row["greek"] not in found]
 
     console.print(
         f"  Cache coverage: {len(cached)}/{len(all_words)} "
@@ -960,21 +1093,6 @@ def build_deck(
 
     # Assemble APKG
     did = deck_id_from_name(deck_name)
-    notes_data = []
-    for row, card in cached:
-        nd = card.to_note_dict()
-        rank = row["rank"]
-        rs = ((rank - 1) // 500) * 500 + 1
-        notes_data.append(
-            {
-                "front": nd["front"],
-                "back": nd["back"],
-                "example": nd["example"],
-                "comment": nd["comment"],
-                "collocations": nd["collocations"],
-                "etymology": nd["etymology"],
-            }
-        )
 
     tags = [
         "auto-generated",
@@ -983,12 +1101,16 @@ def build_deck(
     ]
 
     output_path = create_supplement_apkg(
-        notes_data, output, tags=tags, deck_name=deck_name, deck_id=did
+        (card.to_note_dict() for _, card in cached),
+        output,
+        tags=tags,
+        deck_name=deck_name,
+        deck_id=did,
     )
 
     console.print(f"\n[bold green]Deck built![/bold green]")
     console.print(f"  Deck name:  {deck_name}")
-    console.print(f"  Cards:      {len(notes_data)}")
+    console.print(f"  Cards:      {len(cached)}")
     console.print(f"  Output:     [cyan]{output_path}[/cyan]")
 
 
@@ -1038,25 +1160,19 @@ def cache_status(cache_path, freq_db, rank_range):
             table.add_column("Cached", justify="right")
             table.add_column("Coverage", justify="right")
 
-            with CardCache(cache_path) as cache:
-                for start in range(range_start, range_end + 1, 500):
-                    end = min(start + 499, range_end)
-                    words_in_range = db.get_range(start, end)
-                    if not words_in_range:
-                        continue
-                    cached_count = sum(
-                        1 for row in words_in_range
-                        if cache.get(row["greek"]) is not None
-                    )
-                    total = len(words_in_range)
-                    pct = (cached_count / total * 100) if total > 0 else 0
-                    style = "green" if pct >= 80 else "yellow" if pct >= 50 else "red"
-                    table.add_row(
-                        f"[{start}-{end}]",
-                        str(total),
-                        str(cached_count),
-                        f"[{style}]{pct:.0f}%[/{style}]",
-                    )
+            db.attach_cache(cache_path)
+            for start, total, cached_count in db.get_cache_coverage(
+                range_start, range_end
+            ):
+                end = min(start + 499, range_end)
+                pct = (cached_count / total * 100) if total > 0 else 0
+                style = "green" if pct >= 80 else "yellow" if pct >= 50 else "red"
+                table.add_row(
+                    f"[{start}-{end}]",
+                    str(total),
+                    str(cached_count),
+                    f"[{style}]{pct:.0f}%[/{style}]",
+                )
 
             console.print(table)
 
@@ -1096,7 +1212,7 @@ def tag(apkg_path: str, tags: tuple, output: str, deck_name: str):
       python -m greek_anki tag Greek_top_300.apkg my-watermark
       python -m greek_anki tag deck.apkg shared by-az -o deck_tagged.apkg
     """
-    from .anki_deck import deck_id_from_name
+    import genanki
 
     console.print(f"Reading APKG: {apkg_path}...")
     notes = read_apkg_notes(apkg_path)
@@ -1109,8 +1225,11 @@ def tag(apkg_path: str, tags: tuple, output: str, deck_name: str):
     model = get_anki_model()
     deck = genanki.Deck(d_id, d_name)
 
+    # Existing tags keep their order; new ones are appended once
+    new_tags = tuple(dict.fromkeys(tags))
     for note in notes:
-        merged_tags = list(set(note.tags) | set(tags))
+        existing = set(note.tags)
+        merged_tags = note.tags + [t for t in new_tags if t not in existing]
         n = genanki.Note(
             model=model,
             fields=[
@@ -1122,7 +1241,8 @@ def tag(apkg_path: str, tags: tuple, output: str, deck_name: str):
         )
         deck.add_note(n)
 
-    genanki.Package(deck).write_to_file(str(output_path))
+    # Atomic, so tagging in place never leaves a half-written deck
+    write_package(genanki.Package(deck), output_path)
 
     console.print(f"\n[bold green]Tagged {len(notes)} cards![/bold green]")
     console.print(f"  Added tags: {', '.join(tags)}")
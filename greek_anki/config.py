@@ -17,6 +17,7 @@ DEFAULT_CARD_CACHE = "card_cache.sq3"
 
 # Claude API
 DEFAULT_MODEL = "claude-sonnet-4-5-20250929"
+DEFAULT_CONCURRENCY = 8  # max in-flight API requests when prefetching cards
 PROMPT_TEMPLATE_PATH = Path(__file__).parent.parent / "prompts" / "card_prompt.txt"
 
 # Card template
@@ -3,10 +3,11 @@ import csv
 import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from .config import FUNCTION_WORDS
 from .matcher import normalize_greek
+from .sqlite_utils import select_in_chunks
 
 _SCHEMA = """\
 CREATE TABLE IF NOT EXISTS freq_words (
@@ -15,12 +16,20 @@ CREATE TABLE IF NOT EXISTS freq_words (
     frequency   INTEGER NOT NULL,
     processed   INTEGER DEFAULT 0,
     processed_at TEXT,
-    notes       TEXT
+    notes       TEXT,
+    greek_norm  TEXT
 );
 CREATE INDEX IF NOT EXISTS idx_greek ON freq_words(greek);
+CREATE INDEX IF NOT EXISTS idx_greek_norm ON freq_words(greek_norm);
 CREATE INDEX IF NOT EXISTS idx_processed ON freq_words(processed);
 """
 
+# Rows that belong in a shareable deck: everything except auto-skipped
+# function words (articles, prepositions, ...)
+_DECK_WORDS_FILTER = "NOT (processed = 2 AND notes LIKE 'auto-skip%')"
+
+_NORM_FUNCTION_WORDS = frozenset(normalize_greek(w) for w in FUNCTION_WORDS)
+
 # processed states
 PENDING = 0
 IN_ANKI = 1
@@ -31,6 +40,39 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _migrate_schema(conn: sqlite3.Connection) -> None:
+    """Add and backfill the greek_norm column on databases created before it.
+
+    Runs in one transaction so an interrupted backfill leaves the table as
+    it was. Rows left with a NULL greek_norm by an earlier, non-atomic
+    migration are backfilled too.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(freq_words)")}
+    if not columns:
+        return
+    if "greek_norm" in columns:
+        stale = conn.execute(
+            "SELECT 1 FROM freq_words WHERE greek_norm IS NULL LIMIT 1"
+        ).fetchone()
+        if stale is None:
+            return
+    conn.execute("BEGIN")
+    try:
+        if "greek_norm" not in columns:
+            conn.execute("ALTER TABLE freq_words ADD COLUMN greek_norm TEXT")
+        conn.execute(
+            "UPDATE freq_words SET greek_norm = normalize_greek(greek) "
+            "WHERE greek_norm IS NULL"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_greek_norm ON freq_words(greek_norm)"
+        )
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
 class FreqDB:
     """Interface to the frequency list SQLite database."""
 
@@ -43,8 +85,28 @@ class FreqDB:
             self._conn = sqlite3.connect(str(self.db_path))
             self._conn.row_factory = sqlite3.Row
             self._conn.execute("PRAGMA journal_mode=WAL")
+            # Under WAL, NORMAL skips the fsync on every commit; a power loss
+            # may roll back the latest marks but cannot corrupt the list
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn.execute("PRAGMA cache_size=-65536")
+            self._conn.execute("PRAGMA mmap_size=268435456")
+            self._conn.create_function(
+                "normalize_greek", 1, normalize_greek, deterministic=True
+            )
+            _migrate_schema(self._conn)
         return self._conn
 
+    def _tuple_cursor(self) -> sqlite3.Cursor:
+        """Cursor returning plain tuples, for internal queries read by index.
+
+        Public query methods hand sqlite3.Row objects to callers; internal
+        bulk reads skip that per-row wrapping.
+        """
+        cursor = self._get_conn().cursor()
+        cursor.row_factory = None
+        return cursor
+
     def close(self):
         if self._conn:
             self._conn.close()
@@ -86,23 +148,24 @@ class FreqDB:
             "function_words_skipped": 0,
         }
 
-        norm_function_words = {normalize_greek(w) for w in FUNCTION_WORDS}
-
         # Track seen normalized forms to catch micro-sign / latin-o dupes
         seen_normalized: dict[str, int] = {}
+        now = _now_iso()
+        pending_rows: List[tuple] = []
+        skipped_rows: List[tuple] = []
 
-        with open(csv_path, "r", encoding="utf-8") as f:
+        with open(csv_path, "r", encoding="utf-8", newline="") as f:
             reader = csv.reader(f)
             next(reader)  # skip header
 
             for row_num, row in enumerate(reader, start=1):
                 stats["total_rows"] += 1
 
-                if not row or not row[0].strip():
+                lemma = row[0].strip() if row else ""
+                if not lemma:
                     stats["empty_skipped"] += 1
                     continue
 
-                lemma = row[0].strip()
                 try:
                     frequency = int(row[1])
                 except (IndexError, ValueError):
@@ -117,33 +180,42 @@ class FreqDB:
                     continue
                 seen_normalized[normalized] = row_num
 
-                is_function = normalized in norm_function_words
-
-                try:
-                    if is_function and auto_skip_function_words:
-                        conn.execute(
-                            "INSERT INTO freq_words "
-                            "(rank, greek, frequency, processed, processed_at, notes) "
-                            "VALUES (?, ?, ?, ?, ?, ?)",
-                            (
-                                row_num,
-                                lemma,
-                                frequency,
-                                SKIPPED,
-                                _now_iso(),
-                                "auto-skip: function word",
-                            ),
-                        )
-                        stats["function_words_skipped"] += 1
-                    else:
-                        conn.execute(
-                            "INSERT INTO freq_words (rank, greek, frequency) "
-                            "VALUES (?, ?, ?)",
-                            (row_num, lemma, frequency),
+                is_function = normalized in _NORM_FUNCTION_WORDS
+
+                if is_function and auto_skip_function_words:
+                    skipped_rows.append(
+                        (
+                            row_num,
+                            lemma,
+                            frequency,
+                            SKIPPED,
+                            now,
+                            "auto-skip: function word",
+                            normalized,
                         )
-                    stats["imported"] += 1
-                except sqlite3.IntegrityError:
-                    stats["duplicates_skipped"] += 1
+                    )
+                else:
+                    pending_rows.append((row_num, lemma, frequency, normalized))
+
+        # OR IGNORE skips ranks already in the database; total_changes tells
+        # how many rows each batch actually inserted
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO freq_words "
+            "(rank, greek, frequency, processed, processed_at, notes, greek_norm) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            skipped_rows,
+        )
+        stats["function_words_skipped"] = conn.total_changes - before
+        conn.executemany(
+            "INSERT OR IGNORE INTO freq_words (rank, greek, frequency, greek_norm) "
+            "VALUES (?, ?, ?, ?)",
+            pending_rows,
+        )
+        stats["imported"] = conn.total_changes - before
+        stats["duplicates_skipped"] += (
+            len(skipped_rows) + len(pending_rows) - stats["imported"]
+        )
 
         conn.commit()
         return stats
@@ -160,33 +232,53 @@ class FreqDB:
     ) -> bool:
         """Mark a word as processed. Returns True if a row was updated."""
         conn = self._get_conn()
+        if self._mark_one(conn, greek, status, notes, _now_iso()):
+            conn.commit()
+            return True
+        return False
 
+    def mark_processed_many(
+        self,
+        rows: Iterable[Tuple[str, int, Optional[str]]],
+    ) -> int:
+        """Apply mark_processed to (greek, status, notes) rows in one transaction.
+
+        Returns count of words that matched a row.
+        """
+        conn = self._get_conn()
+        now = _now_iso()
+        updated = sum(
+            self._mark_one(conn, greek, status, notes, now)
+            for greek, status, notes in rows
+        )
+        conn.commit()
+        return updated
+
+    @staticmethod
+    def _mark_one(
+        conn: sqlite3.Connection,
+        greek: str,
+        status: int,
+        notes: Optional[str],
+        now: str,
+    ) -> bool:
         # Exact match first
         cursor = conn.execute(
             "UPDATE freq_words SET processed=?, processed_at=?, notes=? "
             "WHERE greek=?",
-            (status, _now_iso(), notes, greek),
+            (status, now, notes, greek),
         )
         if cursor.rowcount > 0:
-            conn.commit()
             return True
 
-        # Fallback: normalized match
-        normalized = normalize_greek(greek)
-        rows = conn.execute(
-            "SELECT rank, greek FROM freq_words WHERE processed=0"
-        ).fetchall()
-        for row in rows:
-            if normalize_greek(row["greek"]) == normalized:
-                conn.execute(
-                    "UPDATE freq_words SET processed=?, processed_at=?, notes=? "
-                    "WHERE rank=?",
-                    (status, _now_iso(), notes, row["rank"]),
-                )
-                conn.commit()
-                return True
-
-        return False
+        # Fallback: normalized match, first pending row by rank
+        cursor = conn.execute(
+            "UPDATE freq_words SET processed=?, processed_at=?, notes=? "
+            "WHERE rank = (SELECT rank FROM freq_words "
+            "WHERE greek_norm=? AND +processed=0 ORDER BY rank LIMIT 1)",
+            (status, now, notes, normalize_greek(greek)),
+        )
+        return cursor.rowcount > 0
 
     def mark_many_processed(
         self,
@@ -194,31 +286,21 @@ class FreqDB:
         status: int = IN_ANKI,
         notes: Optional[str] = None,
     ) -> int:
-        """Batch mark words as processed. Returns count of updated rows."""
-        conn = self._get_conn()
-        all_rows = conn.execute(
-            "SELECT rank, greek FROM freq_words WHERE processed=0"
-        ).fetchall()
-
-        norm_to_rank: dict[str, int] = {}
-        for row in all_rows:
-            norm = normalize_greek(row["greek"])
-            norm_to_rank[norm] = row["rank"]
+        """Batch mark words as processed. Returns count of updated rows.
 
-        updated = 0
+        Matches on the normalized form and only touches pending rows.
+        """
+        conn = self._get_conn()
         now = _now_iso()
-        for word in greeks:
-            norm = normalize_greek(word)
-            if norm in norm_to_rank:
-                conn.execute(
-                    "UPDATE freq_words SET processed=?, processed_at=?, notes=? "
-                    "WHERE rank=?",
-                    (status, now, notes, norm_to_rank[norm]),
-                )
-                updated += 1
-
+        # Unary + keeps SQLite from picking idx_processed, which matches
+        # nearly every row, over the selective idx_greek_norm
+        cursor = conn.executemany(
+            "UPDATE freq_words SET processed=?, processed_at=?, notes=? "
+            "WHERE greek_norm=? AND +processed=0",
+            [(status, now, notes, normalize_greek(word)) for word in greeks],
+        )
         conn.commit()
-        return updated
+        return cursor.rowcount
 
     # ------------------------------------------------------------------
     # Queries
@@ -264,50 +346,81 @@ class FreqDB:
         return conn.execute(
             "SELECT * FROM freq_words "
             "WHERE rank >= ? AND rank <= ? "
-            "AND NOT (processed = 2 AND notes LIKE 'auto-skip%') "
+            f"AND {_DECK_WORDS_FILTER} "
             "ORDER BY rank",
             (range_start, range_end),
         ).fetchall()
 
-    def get_status_summary(self) -> dict:
-        """Get summary statistics for the status dashboard."""
+    def attach_cache(self, cache_path: str | Path) -> None:
+        """Attach a card cache database as schema "cache" on this connection."""
         conn = self._get_conn()
+        conn.execute("ATTACH DATABASE ? AS cache", (str(cache_path),))
+
+    def get_cache_coverage(
+        self,
+        range_start: int,
+        range_end: int,
+        bucket_size: int = 500,
+    ) -> List[Tuple[int, int, int]]:
+        """Count deck words and cached cards per rank bucket in one query.
 
-        total = conn.execute("SELECT COUNT(*) FROM freq_words").fetchone()[0]
-        in_anki = conn.execute(
-            "SELECT COUNT(*) FROM freq_words WHERE processed=1"
-        ).fetchone()[0]
-        skipped = conn.execute(
-            "SELECT COUNT(*) FROM freq_words WHERE processed=2"
-        ).fetchone()[0]
-        pending = conn.execute(
-            "SELECT COUNT(*) FROM freq_words WHERE processed=0"
-        ).fetchone()[0]
-
-        max_rank = (
-            conn.execute("SELECT MAX(rank) FROM freq_words").fetchone()[0] or 0
+        Buckets start at range_start and step by bucket_size; words are
+        those get_range() returns. Requires attach_cache() first. Returns
+        (bucket_start, words, cached) for non-empty buckets, in rank order.
+        """
+        return self._tuple_cursor().execute(
+            "SELECT ? + ((f.rank - ?) / ?) * ? AS bucket, "
+            "  COUNT(*), "
+            "  COUNT(c.word_normalized) "
+            "FROM freq_words f "
+            "LEFT JOIN cache.card_cache c "
+            "  ON c.word_normalized = f.greek_norm "
+            "WHERE f.rank >= ? AND f.rank <= ? "
+            f"AND {_DECK_WORDS_FILTER} "
+            "GROUP BY bucket ORDER BY bucket",
+            (
+                range_start, range_start, bucket_size, bucket_size,
+                range_start, range_end,
+            ),
+        ).fetchall()
+
+    def get_status_summary(self) -> dict:
+        """Get summary statistics for the status dashboard."""
+        cursor = self._tuple_cursor()
+        counts = (
+            "COUNT(*), "
+            "COUNT(CASE WHEN processed=1 THEN 1 END), "
+            "COUNT(CASE WHEN processed=0 THEN 1 END), "
+            "COUNT(CASE WHEN processed=2 THEN 1 END)"
         )
 
+        total, in_anki, pending, skipped, max_rank = cursor.execute(
+            f"SELECT {counts}, MAX(rank) FROM freq_words"
+        ).fetchone()
+
+        # One grouped pass over the table; buckets with no rows are filled in
+        # below so the ranges still cover 1..max_rank in steps of 500
+        by_bucket = {
+            row[0]: row[1:]
+            for row in cursor.execute(
+                f"SELECT ((rank - 1) / 500) * 500 + 1 AS bucket, {counts} "
+                "FROM freq_words WHERE rank >= 1 GROUP BY bucket"
+            )
+        }
+
         ranges = []
-        for start in range(1, max_rank + 1, 500):
-            end = start + 499
-            row = conn.execute(
-                "SELECT "
-                "  COUNT(*) as total, "
-                "  SUM(CASE WHEN processed=1 THEN 1 ELSE 0 END) as in_anki, "
-                "  SUM(CASE WHEN processed=0 THEN 1 ELSE 0 END) as pending, "
-                "  SUM(CASE WHEN processed=2 THEN 1 ELSE 0 END) as skipped "
-                "FROM freq_words WHERE rank BETWEEN ? AND ?",
-                (start, end),
-            ).fetchone()
+        for start in range(1, (max_rank or 0) + 1, 500):
+            bucket_total, bucket_in_anki, bucket_pending, bucket_skipped = (
+                by_bucket.get(start, (0, 0, 0, 0))
+            )
             ranges.append(
                 {
                     "start": start,
-                    "end": end,
-                    "total": row[0],
-                    "in_anki": row[1],
-                    "pending": row[2],
-                    "skipped": row[3],
+                    "end": start + 499,
+                    "total": bucket_total,
+                    "in_anki": bucket_in_anki,
+                    "pending": bucket_pending,
+                    "skipped": bucket_skipped,
                 }
             )
 
@@ -331,6 +444,37 @@ class FreqDB:
             notes=f"manual skip: {reason}" if reason else "manual skip",
         )
 
+    def get_ranks_bulk(self, words: Iterable[str]) -> Dict[str, int]:
+        """Look up ranks for many words at once (get_word_by_greek semantics).
+
+        Returns a dict of word -> rank for the words found.
+        """
+        cursor = self._tuple_cursor()
+        words = list(dict.fromkeys(words))
+        ranks: Dict[str, int] = {}
+        for greek, rank in select_in_chunks(
+            cursor,
+            "SELECT greek, rank FROM freq_words WHERE greek IN ({placeholders}) "
+            "ORDER BY rank",
+            words,
+        ):
+            ranks.setdefault(greek, rank)
+
+        # Fallback: normalized match, lowest rank wins
+        by_norm: Dict[str, List[str]] = {}
+        for word in words:
+            if word not in ranks:
+                by_norm.setdefault(normalize_greek(word), []).append(word)
+        for norm, rank in select_in_chunks(
+            cursor,
+            "SELECT greek_norm, MIN(rank) FROM freq_words "
+            "WHERE greek_norm IN ({placeholders}) GROUP BY greek_norm",
+            list(by_norm),
+        ):
+            for word in by_norm[norm]:
+                ranks[word] = rank
+        return ranks
+
     def get_word_by_greek(self, greek: str) -> Optional[sqlite3.Row]:
         """Look up a word by its Greek text (normalized matching)."""
         conn = self._get_conn()
@@ -341,9 +485,7 @@ class FreqDB:
         if row:
             return row
 
-        normalized = normalize_greek(greek)
-        all_rows = conn.execute("SELECT * FROM freq_words").fetchall()
-        for r in all_rows:
-            if normalize_greek(r["greek"]) == normalized:
-                return r
-        return None
+        return conn.execute(
+            "SELECT * FROM freq_words WHERE greek_norm=? ORDER BY rank LIMIT 1",
+            (normalize_greek(greek),),
+        ).fetchone()
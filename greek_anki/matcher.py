@@ -1,9 +1,11 @@
 """Greek word matching and normalization."""
+import functools
 import re
 import unicodedata
-from typing import List
+from typing import Dict, Iterable, List, Set, Tuple
 
-from Levenshtein import distance as levenshtein_distance
+from rapidfuzz.distance.Levenshtein import distance as levenshtein_distance
+from rapidfuzz.process import extractOne
 
 from .config import ARTICLES
 
@@ -15,17 +17,26 @@ _CONFUSABLES = {
     "\u006f": "\u03bf",  # LATIN SMALL O -> GREEK SMALL OMICRON
     "\u004f": "\u039f",  # LATIN CAPITAL O -> GREEK CAPITAL OMICRON
 }
+# Applied in one translate pass; NO-BREAK SPACE rides along as a plain space
+_CONFUSABLES_TABLE = str.maketrans({**_CONFUSABLES, "\xa0": " "})
 
 _HTML_TAG_RE = re.compile(r"<[^>]+>")
-_ARTICLE_RE = None  # built lazily
+_ARTICLE_ALTS = "|".join(sorted(ARTICLES, key=len, reverse=True))
+_ARTICLE_RE = re.compile(rf"^({_ARTICLE_ALTS})\s+", re.IGNORECASE)
+# First letters an article can start with, in either case. Checking these
+# first skips the regex for most text; no article starts with a letter
+# that re.IGNORECASE folds beyond upper/lower (like σ/ς or ι/ͅ).
+_ARTICLE_INITIALS = frozenset(
+    c for article in ARTICLES for c in (article[0].lower(), article[0].upper())
+)
+# Once whitespace is collapsed, a match needs a space right after the
+# article, i.e. within the first len(longest article) + 1 characters
+_ARTICLE_SPAN = max(map(len, ARTICLES)) + 1
 
 
-def _get_article_re() -> re.Pattern:
-    global _ARTICLE_RE
-    if _ARTICLE_RE is None:
-        alts = "|".join(sorted(ARTICLES, key=len, reverse=True))
-        _ARTICLE_RE = re.compile(rf"^({alts})\s+", re.IGNORECASE)
-    return _ARTICLE_RE
+def strip_html(text: str) -> str:
+    """Remove HTML tags from an Anki field."""
+    return _HTML_TAG_RE.sub("", text)
 
 
 def normalize_greek(text: str) -> str:
@@ -35,22 +46,32 @@ def normalize_greek(text: str) -> str:
     2. Unicode NFC normalization
     3. Strip HTML tags
     4. Replace &nbsp; with space
-    5. Strip leading articles
-    6. Normalize whitespace
+    5. Normalize whitespace
+    6. Strip leading articles
     7. Lowercase
+
+    Results are memoized: the same words and Back fields are normalized
+    over and over during sync, add and refresh.
     """
-    for latin, greek in _CONFUSABLES.items():
-        text = text.replace(latin, greek)
+    return _normalize_impl(text)
 
-    text = unicodedata.normalize("NFC", text)
-    text = _HTML_TAG_RE.sub("", text)
-    text = text.replace("&nbsp;", " ").replace("\xa0", " ")
 
-    text = text.strip()
-    text = _get_article_re().sub("", text)
+@functools.lru_cache(maxsize=262144)
+def _normalize_impl(text: str) -> str:
+    text = text.translate(_CONFUSABLES_TABLE)
+    # normalize() runs the NFC quick check itself and returns already-NFC
+    # input unchanged; an is_normalized() guard would only add a call
+    text = unicodedata.normalize("NFC", text)
+    if "<" in text:  # most words and Back fields carry no markup
+        text = _HTML_TAG_RE.sub("", text)
+    text = text.replace("&nbsp;", " ")
 
+    # Collapsing whitespace first also trims both ends, so the article
+    # regex sees the text start and neither end needs a separate strip()
     text = " ".join(text.split())
-    return text.lower().strip()
+    if text[:1] in _ARTICLE_INITIALS and " " in text[:_ARTICLE_SPAN]:
+        text = _ARTICLE_RE.sub("", text)
+    return text.lower()
 
 
 def extract_tokens(text: str) -> List[str]:
@@ -58,14 +79,22 @@ def extract_tokens(text: str) -> List[str]:
 
     Splits on comma, slash, and newline, normalizes each token.
     """
-    # Split on newlines BEFORE normalization (normalize_greek collapses whitespace)
-    lines = re.split(r"[\n\r]+", text)
+    return list(_tokens(text))
+
+
+@functools.lru_cache(maxsize=65536)
+def _tokens(text: str) -> Tuple[str, ...]:
+    """Memoized extract_tokens; Back fields are re-tokenized per lookup."""
+    # Split on newlines BEFORE normalization (normalize_greek collapses
+    # whitespace and strips articles per line). Plain str splits replace the
+    # regexes; the empty pieces they leave produce no tokens.
     tokens = []
-    for line in lines:
-        norm = normalize_greek(line)
-        parts = re.split(r"[,/]", norm)
-        tokens.extend(t.strip() for t in parts if t.strip())
-    return tokens
+    for line in text.replace("\r", "\n").split("\n"):
+        for part in normalize_greek(line).replace("/", ",").split(","):
+            part = part.strip()
+            if part:
+                tokens.append(part)
+    return tuple(tokens)
 
 
 def find_note_by_word(word: str, notes) -> "AnkiNote | None":
@@ -76,25 +105,146 @@ def find_note_by_word(word: str, notes) -> "AnkiNote | None":
     norm = normalize_greek(word)
 
     # Pass 1: exact match
+    notes_tokens = []
     for note in notes:
-        tokens = extract_tokens(note.back)
+        tokens = _tokens(note.back)
         if norm in tokens:
             return note
+        notes_tokens.append((note, tokens))
 
     # Pass 2: fuzzy match (only for words > 3 chars)
-    if len(norm) > 3:
-        for note in notes:
-            tokens = extract_tokens(note.back)
-            for token in tokens:
-                if levenshtein_distance(token, norm) <= 1:
-                    return note
+    return _fuzzy_match_note(norm, *_flatten_tokens(notes_tokens))
+
+
+def _flatten_tokens(notes_tokens: Iterable[Tuple]) -> Tuple[List[str], List]:
+    """Flatten (note, tokens) pairs into parallel token / owning-note lists.
+
+    Each distinct token is kept once, owned by the first note that has it;
+    a later copy could never be the first match, so scanning it is wasted.
+    """
+    first_owner: Dict[str, object] = {}
+    for note, tokens in notes_tokens:
+        for token in tokens:
+            first_owner.setdefault(token, note)
+    return list(first_owner), list(first_owner.values())
 
-    return None
+
+def _fuzzy_match_note(norm: str, choices: List[str], owners: List):
+    """Return the owner of the first token within distance 1 of norm.
+
+    Only words > 3 chars are matched fuzzily. extractOne runs the scan in
+    C and keeps the first of equally close tokens, so ties resolve in
+    deck order.
+    """
+    if len(norm) <= 3:
+        return None
+    match = extractOne(norm, choices, scorer=levenshtein_distance, score_cutoff=1)
+    return owners[match[2]] if match else None
+
+
+def find_notes_by_words(words: Iterable[str], notes: Iterable) -> dict:
+    """Look up several words at once with find_note_by_word semantics.
+
+    Returns a dict of word -> note (or None). Stops consuming `notes` as
+    soon as every word has an exact match, so a lazy iterator such as
+    iter_apkg_notes is only read as far as needed. Fuzzy matching needs
+    the whole deck and only runs for words left without an exact match.
+    """
+    pending = {word: normalize_greek(word) for word in words}
+    found = {}
+    # (note, tokens) for every note read so far, reused by the fuzzy pass
+    seen = []
+    for note in notes:
+        if not pending:
+            break
+        tokens = _tokens(note.back)
+        seen.append((note, tokens))
+        for word, norm in list(pending.items()):
+            if norm in tokens:
+                found[word] = note
+                del pending[word]
+
+    # No exact match anywhere in the deck: same fuzzy pass as find_note_by_word
+    if pending:
+        choices, owners = _flatten_tokens(seen)
+        for word, norm in pending.items():
+            found[word] = _fuzzy_match_note(norm, choices, owners)
+    return found
+
+
+def _deletions(word: str) -> Set[str]:
+    """All strings obtained by deleting one character from word."""
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+class TokenIndex:
+    """Normalized Back-field tokens prepared for repeated lookups.
+
+    Supports `token in index` for exact matches. Fuzzy lookups use a
+    symmetric-delete index: each token is also filed under its one-character
+    deletions, so a query only probes its own deletions instead of being
+    compared against every token in the deck.
+    """
+
+    def __init__(self, tokens: Iterable[str]):
+        self.tokens: Set[str] = set(tokens)
+        self._deletes: Dict[str, List[str]] = {}
+        for token in self.tokens:
+            for variant in _deletions(token):
+                self._deletes.setdefault(variant, []).append(token)
+
+    def __contains__(self, token: str) -> bool:
+        return token in self.tokens
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def has_near(self, token: str) -> bool:
+        """Return True if some token is within Levenshtein distance 1."""
+        if token in self.tokens or token in self._deletes:
+            # Equal, or one insertion away from an indexed token
+            return True
+        for variant in _deletions(token):
+            if variant in self.tokens:
+                return True
+            # Shared deletion: a substitution, or a transposition (distance 2)
+            for candidate in self._deletes.get(variant, ()):
+                if levenshtein_distance(candidate, token, score_cutoff=1) <= 1:
+                    return True
+        return False
+
+
+def build_token_index(anki_back_fields: Iterable[str]) -> TokenIndex:
+    """Tokenize and normalize Back fields once for repeated lookups.
+
+    Pass the result to freq_word_in_index when checking many words against
+    the same deck.
+    """
+    return TokenIndex(
+        token for back in anki_back_fields for token in _tokens(back)
+    )
+
+
+def freq_word_in_index(freq_word: str, token_index: TokenIndex) -> bool:
+    """Check a frequency list word against a prebuilt token index.
+
+    Exact token match, or Levenshtein distance ≤ 1 for words > 3 chars.
+    """
+    freq_normalized = normalize_greek(freq_word)
+    if freq_normalized in token_index:
+        return True
+    if len(freq_normalized) > 3:
+        return token_index.has_near(freq_normalized)
+    return False
 
 
 def freq_word_in_anki(freq_word: str, anki_back_fields: List[str]) -> bool:
     """Check if a frequency list word exists in any Anki Back field.
 
+    Tokenizes every Back field on each call. To check many words against
+    the same deck, build the index once with build_token_index and use
+    freq_word_in_index.
+
     Args:
         freq_word: A lemma from the frequency list.
         anki_back_fields: List of Back field values from existing Anki notes.
@@ -102,14 +252,4 @@ def freq_word_in_anki(freq_word: str, anki_back_fields: List[str]) -> bool:
     Returns:
         True if the word is found in the deck.
     """
-    freq_normalized = normalize_greek(freq_word)
-
-    for back_field in anki_back_fields:
-        tokens = extract_tokens(back_field)
-        for token in tokens:
-            if token == freq_normalized:
-                return True
-            if len(freq_normalized) > 3 and levenshtein_distance(token, freq_normalized) <= 1:
-                return True
-
-    return False
+    return freq_word_in_index(freq_word, build_token_index(anki_back_fields))
@@ -0,0 +1,22 @@
+"""SQLite helpers shared by the frequency list and the card cache."""
+import sqlite3
+from typing import Iterator, Sequence
+
+# Stay under SQLITE_MAX_VARIABLE_NUMBER (999 on older SQLite builds)
+MAX_SQL_PARAMS = 900
+
+
+def select_in_chunks(
+    conn: sqlite3.Connection | sqlite3.Cursor,
+    query: str,
+    values: Sequence,
+) -> Iterator[tuple]:
+    """Run an IN (...) query over many values, MAX_SQL_PARAMS at a time.
+
+    `query` holds a `{placeholders}` field for the IN list. Rows from all
+    chunks are yielded in chunk order; any ORDER BY applies per chunk.
+    """
+    for i in range(0, len(values), MAX_SQL_PARAMS):
+        chunk = values[i:i + MAX_SQL_PARAMS]
+        placeholders = ",".join("?" * len(chunk))
+        yield from conn.execute(query.format(placeholders=placeholders), chunk)
@@ -0,0 +1,57 @@
+"""Card cache storage and prefetching."""
+import json
+import sqlite3
+
+import pytest
+
+from greek_anki.card_cache import CardCache, prefetch_cards
+
+
+@pytest.mark.parametrize("concurrency", [0, -1])
+def test_prefetch_rejects_non_positive_concurrency(tmp_path, concurrency):
+    with CardCache(tmp_path / "cache.sq3") as cache:
+        with pytest.raises(ValueError):
+            prefetch_cards(["λέξη"], cache, concurrency=concurrency)
+
+
+def test_get_cached_words_beyond_one_chunk(tmp_path):
+    words = [f"λέξη{n}" for n in range(2000)]
+    with CardCache(tmp_path / "cache.sq3") as cache:
+        cache.store_many([(w, {"back": w}, "model") for w in words[::2]])
+        assert cache.get_cached_words(words) == set(words[::2])
+
+
+def test_migration_rebuilds_rowid_table(tmp_path):
+    path = tmp_path / "cache.sq3"
+    conn = sqlite3.connect(path)
+    # card_cache as created before it became WITHOUT ROWID
+    conn.execute(
+        "CREATE TABLE card_cache ("
+        "word_normalized TEXT PRIMARY KEY, word_original TEXT NOT NULL, "
+        "card_json TEXT NOT NULL, model TEXT NOT NULL, "
+        "created_at TEXT NOT NULL, updated_at TEXT NOT NULL)"
+    )
+    rows = [
+        ("σπίτι", "το σπίτι", json.dumps({"back": "σπίτι"}), "m1", "t0", "t1"),
+        ("λόγος", "Λόγος", json.dumps({"back": "λόγος"}), "m2", "t2", "t3"),
+    ]
+    conn.executemany("INSERT INTO card_cache VALUES (?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+    with CardCache(path) as cache:
+        assert cache.get("σπίτι") == {"back": "σπίτι"}
+        assert cache.get_cached_words(["το σπίτι", "λόγος", "νερό"]) == {
+            "το σπίτι", "λόγος",
+        }
+
+    conn = sqlite3.connect(path)
+    (sql,) = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type='table' AND name='card_cache'"
+    ).fetchone()
+    assert "WITHOUT ROWID" in sql.upper()
+    assert sorted(conn.execute("SELECT * FROM card_cache")) == sorted(rows)
+    assert conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE name='card_cache_old'"
+    ).fetchone() == (0,)
+    conn.close()
@@ -0,0 +1,103 @@
+"""CLI option handling."""
+import pytest
+from click.testing import CliRunner
+
+from greek_anki import cli as cli_module
+
+
+@pytest.fixture
+def apkg(tmp_path):
+    path = tmp_path / "deck.apkg"
+    path.write_bytes(b"")
+    return str(path)
+
+
+@pytest.mark.parametrize("limit", ["0", "-1"])
+def test_enrich_rejects_non_positive_limit(apkg, limit):
+    result = CliRunner().invoke(cli_module.cli, ["enrich", apkg, "-n", limit])
+    assert result.exit_code == 2
+    assert "Invalid value for '--limit' / '-n'" in result.output
+
+
+def test_enrich_accepts_limit_of_one(apkg, monkeypatch):
+    seen = []
+
+    def fake_find_candidates(path, predicate, limit):
+        seen.append(limit)
+        return []
+
+    monkeypatch.setattr(cli_module, "find_candidates", fake_find_candidates)
+    result = CliRunner().invoke(cli_module.cli, ["enrich", apkg, "-n", "1"])
+    assert result.exit_code == 0, result.output
+    assert seen == [1]
+
+
+@pytest.mark.parametrize("concurrency", ["0", "-1"])
+def test_add_rejects_non_positive_concurrency(concurrency):
+    result = CliRunner().invoke(
+        cli_module.cli, ["add", "λέξη", "--no-review", "-j", concurrency]
+    )
+    assert result.exit_code == 2
+    assert "Invalid value for '--concurrency' / '-j'" in result.output
+
+
+@pytest.mark.parametrize("concurrency", ["0", "-1"])
+def test_add_batch_rejects_non_positive_concurrency(apkg, concurrency):
+    result = CliRunner().invoke(
+        cli_module.cli,
+        ["add-batch", apkg, apkg, "-n", "1", "--no-review", "-y", "-j", concurrency],
+    )
+    assert result.exit_code == 2
+    assert "Invalid value for '--concurrency' / '-j'" in result.output
+
+
+def test_add_marks_freq_db_in_one_write(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    from greek_anki import card_cache
+    from greek_anki.freq_list import IN_ANKI, FreqDB
+
+    freq_path = tmp_path / "freq_list.sq3"
+    with FreqDB(freq_path) as db:
+        db.init_schema()
+        db._get_conn().executemany(
+            "INSERT INTO freq_words (rank, greek, frequency, greek_norm) "
+            "VALUES (?, ?, ?, ?)",
+            [(1, "σπίτι", 10, "σπίτι"), (2, "λόγος", 9, "λόγος")],
+        )
+        db._get_conn().commit()
+
+    writes = []
+    mark_processed_many = FreqDB.mark_processed_many
+
+    def recording_mark_processed_many(self, rows):
+        rows = list(rows)
+        writes.append(rows)
+        return mark_processed_many(self, rows)
+
+    monkeypatch.setattr(FreqDB, "mark_processed_many", recording_mark_processed_many)
+    opened = []
+    monkeypatch.setattr(
+        cli_module, "FreqDB", lambda path: opened.append(path) or FreqDB(path)
+    )
+    monkeypatch.setattr(
+        card_cache, "generate_card_cached",
+        lambda word, cache, model=None, force=False: SimpleNamespace(
+            part_of_speech="noun"
+        ),
+    )
+    monkeypatch.setattr(
+        cli_module, "_create_batch_apkg", lambda cards, name: tmp_path / name
+    )
+    result = CliRunner().invoke(cli_module.cli, [
+        "add", "σπίτι", "--no-review", "--freq-db", str(freq_path),
+        "--cache", str(tmp_path / "cache.sq3"),
+    ])
+    assert result.exit_code == 0, result.output
+    assert len(opened) == 1
+    assert len(writes) == 1
+    assert [(word, status) for word, status, _notes in writes[0]] == [
+        ("σπίτι", IN_ANKI)
+    ]
+    with FreqDB(freq_path) as db:
+        assert db.get_word_by_greek("σπίτι")["processed"] == IN_ANKI
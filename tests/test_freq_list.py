@@ -0,0 +1,99 @@
+"""Frequency list database."""
+import sqlite3
+
+import pytest
+
+from greek_anki import freq_list
+from greek_anki.freq_list import FreqDB
+
+# freq_words as created before the greek_norm column existed
+_OLD_SCHEMA = """\
+CREATE TABLE freq_words (
+    rank        INTEGER PRIMARY KEY,
+    greek       TEXT NOT NULL,
+    frequency   INTEGER NOT NULL,
+    processed   INTEGER DEFAULT 0,
+    processed_at TEXT,
+    notes       TEXT
+);
+CREATE INDEX idx_greek ON freq_words(greek);
+CREATE INDEX idx_processed ON freq_words(processed);
+"""
+
+_WORDS = [("το σπίτι", 10), ("Λόγος", 9), ("µήλο", 8)]  # article, case, MICRO SIGN
+
+
+@pytest.fixture
+def old_db(tmp_path):
+    path = tmp_path / "freq_list.sq3"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(_OLD_SCHEMA)
+        conn.executemany(
+            "INSERT INTO freq_words (rank, greek, frequency) VALUES (?, ?, ?)",
+            [(rank, greek, freq) for rank, (greek, freq) in enumerate(_WORDS, 1)],
+        )
+    conn.close()
+    return path
+
+
+def _norms(path):
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute("SELECT greek, greek_norm FROM freq_words ORDER BY rank")
+        result = rows.fetchall()
+    conn.close()
+    return result
+
+
+def test_migration_backfills_greek_norm(old_db):
+    with FreqDB(old_db) as db:
+        assert db.get_word_by_greek("μήλο")["rank"] == 3
+    assert _norms(old_db) == [
+        ("το σπίτι", "σπίτι"), ("Λόγος", "λόγος"), ("µήλο", "μήλο"),
+    ]
+
+
+def test_interrupted_migration_rolls_back(old_db, monkeypatch):
+    calls = []
+
+    def failing_normalize(text):
+        calls.append(text)
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        return text
+
+    monkeypatch.setattr(freq_list, "normalize_greek", failing_normalize)
+    with pytest.raises(sqlite3.OperationalError):
+        FreqDB(old_db).get_word_by_greek("μήλο")
+    with sqlite3.connect(old_db) as conn:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(freq_words)")}
+    conn.close()
+    assert "greek_norm" not in columns
+
+    monkeypatch.undo()
+    with FreqDB(old_db) as db:
+        assert db.get_word_by_greek("μήλο")["rank"] == 3
+
+
+def test_migration_repairs_null_norms(old_db):
+    # State left by the old, non-atomic migration after an interrupted backfill
+    with sqlite3.connect(old_db) as conn:
+        conn.execute("ALTER TABLE freq_words ADD COLUMN greek_norm TEXT")
+    conn.close()
+    with FreqDB(old_db) as db:
+        assert db.get_word_by_greek("μήλο")["rank"] == 3
+    assert all(norm is not None for _greek, norm in _norms(old_db))
+
+
+def test_get_ranks_bulk_beyond_one_chunk(tmp_path):
+    words = [f"λέξη{n}" for n in range(2000)]
+    with FreqDB(tmp_path / "freq_list.sq3") as db:
+        db.init_schema()
+        db._get_conn().executemany(
+            "INSERT INTO freq_words (rank, greek, frequency, greek_norm) "
+            "VALUES (?, ?, ?, ?)",
+            [(rank, w, 1, w) for rank, w in enumerate(words, 1)],
+        )
+        # Exact spellings, plus case variants that only match via greek_norm
+        ranks = db.get_ranks_bulk(words + [w.upper() for w in words])
+    assert len(ranks) == 4000
+    assert ranks["λέξη1999"] == ranks["ΛΈΞΗ1999"] == 2000
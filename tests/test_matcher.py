@@ -0,0 +1,59 @@
+"""Greek word matching."""
+import random
+
+import pytest
+from rapidfuzz.distance.Levenshtein import distance as levenshtein_distance
+
+from greek_anki.matcher import TokenIndex
+
+_TOKENS = ["λόγος", "σπίτι", "αίτηση", "πρόταση", "κίνηση", "νερό", "μήλο"]
+_ALPHABET = sorted(set("".join(_TOKENS))) + ["ω"]
+
+
+def _brute_force_near(token, tokens):
+    return any(levenshtein_distance(token, t) <= 1 for t in tokens)
+
+
+def _single_edits(word):
+    """Every insertion, deletion and substitution of one character."""
+    edits = set()
+    for i in range(len(word) + 1):
+        for c in _ALPHABET:
+            edits.add(word[:i] + c + word[i:])
+    for i in range(len(word)):
+        edits.add(word[:i] + word[i + 1:])
+        for c in _ALPHABET:
+            edits.add(word[:i] + c + word[i + 1:])
+    return edits
+
+
+@pytest.fixture(scope="module")
+def index():
+    return TokenIndex(_TOKENS)
+
+
+def test_has_near_matches_brute_force_on_single_edits(index):
+    for token in _TOKENS:
+        for query in _single_edits(token):
+            assert index.has_near(query) == _brute_force_near(query, _TOKENS), query
+
+
+def test_has_near_matches_brute_force_on_random_words(index):
+    rng = random.Random(0)
+    for _ in range(5000):
+        query = "".join(rng.choices(_ALPHABET, k=rng.randint(1, 8)))
+        assert index.has_near(query) == _brute_force_near(query, _TOKENS), query
+
+
+@pytest.mark.parametrize("query", ["λγόος", "σπίιτ", "αίτηησ"])
+def test_has_near_rejects_transpositions(index, query):
+    assert not _brute_force_near(query, _TOKENS)
+    assert not index.has_near(query)
+
+
+def test_has_near_covers_each_edit_kind(index):
+    assert index.has_near("λόγος")  # equal
+    assert index.has_near("λόγοςς")  # insertion
+    assert index.has_near("λόγς")  # deletion
+    assert index.has_near("λύγος")  # substitution
+    assert not index.has_near("λύγοι")  # two substitutions
@@ -0,0 +1,23 @@
+"""Shared SQLite helpers."""
+import sqlite3
+
+from greek_anki.sqlite_utils import MAX_SQL_PARAMS, select_in_chunks
+
+
+def test_select_in_chunks_spans_several_chunks():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (n INTEGER)")
+    conn.executemany("INSERT INTO t VALUES (?)", ((n,) for n in range(3000)))
+    wanted = list(range(0, 3000, 2))
+    assert len(wanted) > MAX_SQL_PARAMS
+    rows = select_in_chunks(
+        conn, "SELECT n FROM t WHERE n IN ({placeholders}) ORDER BY n", wanted
+    )
+    assert [n for (n,) in rows] == wanted
+    conn.close()
+
+
+def test_select_in_chunks_without_values_runs_nothing():
+    conn = sqlite3.connect(":memory:")
+    assert list(select_in_chunks(conn, "SELECT * FROM missing {placeholders}", [])) == []
+    conn.close()